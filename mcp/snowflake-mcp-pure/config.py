@@ -1,28 +1,108 @@
 """
 Configuration models for Snowflake MCP Server.
 
-Provides type-safe configuration management using Pydantic models
-with environment variable integration.
+Provides type-safe configuration management using slotted, frozen
+dataclasses with environment variable integration.
+
+Plain stdlib dataclasses are used on purpose: the configs are built once
+from trusted environment values, so a validating struct library (Pydantic,
+msgspec) would only add a dependency without a measurable win.
 """
 
 import os
-from typing import Optional
+import sys
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import ClassVar, Optional
+
+
+# Every environment variable SnowflakeConfig.from_env() reads
+_SNOWFLAKE_ENV_KEYS = (
+    "SNOWFLAKE_ACCOUNT",
+    "SNOWFLAKE_USER",
+    "SNOWFLAKE_PASSWORD",
+    "SNOWFLAKE_WAREHOUSE",
+    "SNOWFLAKE_DATABASE",
+    "SNOWFLAKE_SCHEMA",
+    "SNOWFLAKE_ROLE",
+)
+
+# Subset of the above that must be set
+_REQUIRED_SNOWFLAKE_ENV_KEYS = (
+    "SNOWFLAKE_ACCOUNT",
+    "SNOWFLAKE_USER",
+    "SNOWFLAKE_PASSWORD",
+)
+
+
+# ---------------------------------------------------------------------------
+# .env loading
+# ---------------------------------------------------------------------------
+
+# The .env file only needs to be parsed once per process. from_env() may be
+# called many times (lazy config, reconnects), so we guard load_dotenv()
+# with a flag + lock instead of re-reading the file on every call.
+_DOTENV_LOADED = False
+_DOTENV_LOCK = threading.Lock()
+
 
-from pydantic import BaseModel, Field
-from dotenv import load_dotenv
+def _ensure_dotenv() -> None:
+    """Load variables from a local .env file, at most once per process."""
+    global _DOTENV_LOADED
+    if _DOTENV_LOADED:
+        return
+    with _DOTENV_LOCK:
+        if not _DOTENV_LOADED:
+            # Imported lazily so `import config` stays cheap for tooling
+            # that never builds a config.
+            from dotenv import load_dotenv
+            load_dotenv()
+            # .env may have introduced new values - drop stale parses
+            _getenv_int.cache_clear()
+            _DOTENV_LOADED = True
 
 
-class SnowflakeConfig(BaseModel):
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern a non-empty config string so repeated copies share one object."""
+    return sys.intern(value) if value else None
+
+
+@lru_cache(maxsize=None)
+def _getenv_int(name: str, default: int) -> int:
+    """Return an integer environment variable, parsed once per process."""
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _getenv_positive_int(name: str, default: int) -> int:
+    """Return an integer environment variable that must be at least 1."""
+    value = _getenv_int(name, default)
+    if value < 1:
+        raise RuntimeError(f"{name} must be at least 1, got {value}")
+    return value
+
+
+@dataclass(slots=True, frozen=True)
+class SnowflakeConfig:
     """Configuration model for Snowflake connection using password authentication."""
     
-    account: str = Field(..., description="Snowflake account identifier")
-    user: str = Field(..., description="Snowflake username")
-    password: str = Field(..., description="Snowflake password")
-    warehouse: Optional[str] = Field(None, description="Default warehouse")
-    database: Optional[str] = Field(None, description="Default database") 
-    schema_name: Optional[str] = Field(None, description="Default schema")
-    role: Optional[str] = Field(None, description="Default role")
-    timeout: int = Field(30, description="Default query timeout in seconds")
+    account: str                        # Snowflake account identifier
+    user: str                           # Snowflake username
+    password: str                       # Snowflake password
+    warehouse: Optional[str] = None     # Default warehouse
+    database: Optional[str] = None      # Default database
+    schema_name: Optional[str] = None   # Default schema
+    role: Optional[str] = None          # Default role
+    timeout: int = 30                   # Default query timeout in seconds
+    
+    # Optional fields -> connector parameter names (only sent when set)
+    _OPTIONAL_PARAM_MAP: ClassVar[tuple[tuple[str, str], ...]] = (
+        ("warehouse", "warehouse"),
+        ("database", "database"),
+        ("schema_name", "schema"),
+        ("role", "role"),
+    )
     
     @classmethod
     def from_env(cls) -> "SnowflakeConfig":
@@ -40,66 +120,123 @@ class SnowflakeConfig(BaseModel):
         - SNOWFLAKE_ROLE
         - SNOWFLAKE_TIMEOUT (default: 30)
         """
-        # Load environment variables from .env file
-        load_dotenv()
+        # Load environment variables from .env file (first call only)
+        _ensure_dotenv()
         
-        account = os.getenv("SNOWFLAKE_ACCOUNT", "")
-        user = os.getenv("SNOWFLAKE_USER", "")
-        password = os.getenv("SNOWFLAKE_PASSWORD", "")
+        # Read all SNOWFLAKE_* variables in one pass over os.environ
+        env = os.environ
+        values = {key: env.get(key) for key in _SNOWFLAKE_ENV_KEYS}
         
-        if not account:
-            raise RuntimeError("Missing required environment variable: SNOWFLAKE_ACCOUNT")
-        if not user:
-            raise RuntimeError("Missing required environment variable: SNOWFLAKE_USER")
-        if not password:
-            raise RuntimeError("Missing required environment variable: SNOWFLAKE_PASSWORD")
+        # Fail fast on missing credentials. With get_snowflake_config() this
+        # only runs once per process.
+        for name in _REQUIRED_SNOWFLAKE_ENV_KEYS:
+            if not values[name]:
+                raise RuntimeError(f"Missing required environment variable: {name}")
         
+        account = values["SNOWFLAKE_ACCOUNT"]
+        user = values["SNOWFLAKE_USER"]
+        password = values["SNOWFLAKE_PASSWORD"]
+        
+        # Dataclasses do no type coercion, so timeout is parsed to int here.
+        # Short identifiers are repeated in every connection; intern them.
         return cls(
-            account=account,
-            user=user,
+            account=_intern(account),
+            user=_intern(user),
             password=password,
-            warehouse=os.getenv("SNOWFLAKE_WAREHOUSE"),
-            database=os.getenv("SNOWFLAKE_DATABASE"),
-            schema_name=os.getenv("SNOWFLAKE_SCHEMA"),
-            role=os.getenv("SNOWFLAKE_ROLE"),
-            timeout=int(os.getenv("SNOWFLAKE_TIMEOUT", "30")),
+            warehouse=_intern(values["SNOWFLAKE_WAREHOUSE"]),
+            database=_intern(values["SNOWFLAKE_DATABASE"]),
+            schema_name=_intern(values["SNOWFLAKE_SCHEMA"]),
+            role=_intern(values["SNOWFLAKE_ROLE"]),
+            timeout=_getenv_int("SNOWFLAKE_TIMEOUT", 30),
         )
     
     def to_connection_params(self) -> dict:
-        """Convert to Snowflake connector parameters."""
+        """Convert to Snowflake connector parameters.
+        
+        The dict is built once per config (it's frozen) and each call returns
+        a shallow copy, so callers may modify the result freely.
+        """
+        return dict(_connection_params(self))
+    
+    def _build_connection_params(self) -> dict:
+        """Build the connector parameters; cached by _connection_params()."""
         params = {
             "account": self.account,
             "user": self.user,
             "password": self.password,
             "client_session_keep_alive": True,
+            # Heartbeat every 15 minutes so idle sessions never expire
+            "client_session_keep_alive_heartbeat_frequency": 900,
         }
         
         # Add optional parameters if they exist
-        if self.warehouse:
-            params["warehouse"] = self.warehouse
-        if self.database:
-            params["database"] = self.database
-        if self.schema_name:
-            params["schema"] = self.schema_name
-        if self.role:
-            params["role"] = self.role
-            
+        params.update({
+            dst: value
+            for attr, dst in self._OPTIONAL_PARAM_MAP
+            if (value := getattr(self, attr))
+        })
         return params
 
 
-class ServerConfig(BaseModel):
+# Frozen configs are hashable, so connection params are memoized per config
+# value here rather than in a field that asdict() and repr() would expose
+@lru_cache(maxsize=None)
+def _connection_params(config: SnowflakeConfig) -> dict:
+    return config._build_connection_params()
+
+
+@dataclass(slots=True, frozen=True)
+class ServerConfig:
     """Configuration for the MCP server itself."""
     
-    log_level: str = Field("INFO", description="Logging level")
-    max_query_rows: int = Field(10000, description="Maximum rows to return from queries")
+    log_level: str = "INFO"             # Logging level
+    max_query_rows: int = 10000         # Maximum rows to return from queries
+    max_concurrent_queries: int = 8     # Worker threads for Snowflake queries
+    local_cache_ttl: int = 60           # Seconds to keep local query results (0 = off)
     
     @classmethod
     def from_env(cls) -> "ServerConfig":
         """Create server configuration from environment variables."""
-        # Load environment variables from .env file
-        load_dotenv()
+        # Load environment variables from .env file (first call only)
+        _ensure_dotenv()
         
         return cls(
-            log_level=os.getenv("LOG_LEVEL", "INFO"),
-            max_query_rows=int(os.getenv("MAX_QUERY_ROWS", "10000")),
+            log_level=sys.intern(os.environ.get("LOG_LEVEL") or "INFO"),
+            max_query_rows=_getenv_int("MAX_QUERY_ROWS", 10000),
+            max_concurrent_queries=_getenv_positive_int("MAX_CONCURRENT_QUERIES", 8),
+            local_cache_ttl=_getenv_int("LOCAL_CACHE_TTL", 60),
         )
+
+
+# ---------------------------------------------------------------------------
+# Process-wide config singletons
+# ---------------------------------------------------------------------------
+
+# Configuration is global and immutable once read, so every caller after
+# the first gets the same instances back instead of re-reading the env.
+_snowflake_config: Optional[SnowflakeConfig] = None
+_server_config: Optional[ServerConfig] = None
+
+
+def get_snowflake_config() -> SnowflakeConfig:
+    """Return the process-wide SnowflakeConfig, loading it on first use."""
+    global _snowflake_config
+    if _snowflake_config is None:
+        _snowflake_config = SnowflakeConfig.from_env()
+    return _snowflake_config
+
+
+def get_server_config() -> ServerConfig:
+    """Return the process-wide ServerConfig, loading it on first use."""
+    global _server_config
+    if _server_config is None:
+        _server_config = ServerConfig.from_env()
+    return _server_config
+
+
+def reset_config() -> None:
+    """Forget cached configs so the next getter call re-reads the env (tests)."""
+    global _snowflake_config, _server_config
+    _snowflake_config = None
+    _server_config = None
+    _getenv_int.cache_clear()
@@ -24,13 +24,21 @@ Authentication: Password-based (SNOWFLAKE_USER + SNOWFLAKE_PASSWORD)
 import os
 import re
 import json
+import math
 import asyncio
 import logging
-from datetime import datetime
+import hashlib
+import functools
+import itertools
+import concurrent.futures
+import importlib.util
+from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional
 
 import snowflake.connector
 from snowflake.connector import DictCursor
+from snowflake.connector.errors import NotSupportedError
+from cachetools import TTLCache
 from dotenv import load_dotenv
 
 from mcp.server import Server, NotificationOptions
@@ -38,7 +46,33 @@ from mcp.server import stdio as mcp_stdio
 from mcp.server.models import InitializationOptions
 import mcp.types as types
 
-from config import SnowflakeConfig, ServerConfig
+# Optional: Aho-Corasick automaton for the forbidden-keyword scan
+# (pip install pyahocorasick). Falls back to the combined regex if missing.
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# Optional: stream results as Arrow batches when pyarrow is available
+# (pip install "snowflake-connector-python[pandas]"). Checked without
+# importing, since the connector loads pyarrow itself when needed.
+_HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+# Optional: orjson (C extension) for serializing result rows. Falls back
+# to the stdlib json module if missing.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Optional: msgspec as the next-best encoder when orjson is not installed.
+# Benchmarked slower than orjson on result rows, so it is not preferred.
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+from config import SnowflakeConfig, ServerConfig, get_snowflake_config, get_server_config
 
 
 # ---------------------------------------------------------------------------
@@ -50,6 +84,22 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("snowflake-mcp")
 
+# Auto-generated query tags: a process start stamp plus a counter, which is
+# unique per query without formatting a timestamp on every call
+_QUERY_TAG_PREFIX = f"mcp_{datetime.now():%Y%m%d_%H%M%S}_"
+_query_tag_counter = itertools.count(1)
+
+
+# Precompiled patterns used by QueryValidator._normalize_query
+_COMMENT_LINE_RE = re.compile(r'--.*?\n')
+_COMMENT_BLOCK_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _is_word_char(char: str) -> bool:
+    """Return True for characters that count as part of a word for regex word boundaries."""
+    return char.isalnum() or char == '_'
+
 
 # ---------------------------------------------------------------------------
 # QueryValidator Class (from sophisticated server)
@@ -70,14 +120,61 @@ class QueryValidator:
         'USE ROLE', 'USE WAREHOUSE', 'USE DATABASE', 'USE SCHEMA'
     }
     
+    # First word of every forbidden keyword. If none of these occur anywhere
+    # in the query as plain substrings, no keyword can match, so the scan
+    # below can be skipped with a few C-level `in` checks.
+    _FORBIDDEN_PREFILTER = tuple(sorted({keyword.split(' ')[0] for keyword in FORBIDDEN_KEYWORDS}))
+    
+    # All forbidden keywords as one word-bounded alternation, longest first so
+    # multi-word entries win. Spaces in e.g. 'USE ROLE' match any whitespace.
+    _FORBIDDEN_RE = re.compile(
+        r'\b('
+        + '|'.join(
+            re.escape(keyword).replace(r'\ ', r'\s+')
+            for keyword in sorted(FORBIDDEN_KEYWORDS, key=len, reverse=True)
+        )
+        + r')\b'
+    )
+    
+    # Same keyword set as an Aho-Corasick automaton: one linear scan over
+    # the normalized query regardless of how many keywords there are.
+    if ahocorasick is not None:
+        _FORBIDDEN_AC = ahocorasick.Automaton()
+        for _keyword in FORBIDDEN_KEYWORDS:
+            _FORBIDDEN_AC.add_word(_keyword, _keyword)
+        _FORBIDDEN_AC.make_automaton()
+        del _keyword
+    else:
+        _FORBIDDEN_AC = None
+    
     @classmethod
     def is_read_only_query(cls, query: str) -> tuple[bool, str]:
         """
         Validate if a query is read-only and safe to execute.
         
+        Results are memoized per process for queries shorter than
+        _VALIDATION_CACHE_MAX_LEN, since clients often re-issue the same SQL.
+        
+        Oversized queries and queries with many block comments are rejected
+        before any regex runs: the non-greedy comment pattern is quadratic on
+        input with many unterminated '/*', so this bounds the worst case.
+        
         Returns:
             tuple: (is_valid, error_message)
         """
+        if query:
+            if len(query) > _MAX_QUERY_LENGTH:
+                return False, f"Query too long (max {_MAX_QUERY_LENGTH} characters)"
+            if query.count('/*') > _MAX_BLOCK_COMMENTS:
+                return False, f"Too many block comments (max {_MAX_BLOCK_COMMENTS})"
+        
+        if query and len(query) < _VALIDATION_CACHE_MAX_LEN:
+            return _validate_query_cached(query)
+        return cls._validate(query)
+    
+    @classmethod
+    def _validate(cls, query: str) -> tuple[bool, str]:
+        """Uncached validation logic behind is_read_only_query."""
         if not query or not query.strip():
             return False, "Query cannot be empty"
         
@@ -103,33 +200,63 @@ class QueryValidator:
     
     @classmethod
     def _normalize_query(cls, query: str) -> str:
-        """Normalize query for analysis."""
+        """Normalize query for analysis.
+        
+        The query is uppercased once here on purpose: every later check
+        (substring prefilter, Aho-Corasick, CTE check) relies on it, and a
+        single upper() is far cheaper than case-insensitive matching in each.
+        """
+        # Fast path: no comments and already single-space separated (the
+        # common case for generated SQL). isprintable() is False for any
+        # whitespace other than ' ', so newlines/tabs still take the slow path.
+        if '--' not in query and '/*' not in query and '  ' not in query and query.isprintable():
+            return query.strip().upper()
+        
         # Remove comments
-        query = re.sub(r'--.*?\n', ' ', query)
-        query = re.sub(r'/\*.*?\*/', ' ', query, flags=re.DOTALL)
+        query = _COMMENT_LINE_RE.sub(' ', query)
+        query = _COMMENT_BLOCK_RE.sub(' ', query)
         
         # Normalize whitespace
-        query = re.sub(r'\s+', ' ', query.strip().upper())
+        query = _WHITESPACE_RE.sub(' ', query.strip().upper())
         
         return query
     
     @classmethod
     def _starts_with_allowed_statement(cls, query: str) -> bool:
         """Check if query starts with an allowed statement."""
-        for statement in cls.ALLOWED_STATEMENTS:
-            if query.startswith(statement + ' ') or query == statement:
-                return True
-        return False
+        # Query is already uppercased with single-space separators. Slice the
+        # first token rather than split(), which would copy the whole rest of
+        # the query just to discard it.
+        end = query.find(' ')
+        first_token = query if end < 0 else query[:end]
+        return first_token in cls.ALLOWED_STATEMENTS
     
     @classmethod
     def _contains_forbidden_keywords(cls, query: str) -> Optional[str]:
         """Check for forbidden keywords in the query."""
-        for keyword in cls.FORBIDDEN_KEYWORDS:
-            # Use word boundaries to avoid false positives
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            if re.search(pattern, query):
+        # Cheap bail-out for the common clean SELECT
+        for word in cls._FORBIDDEN_PREFILTER:
+            if word in query:
+                break
+        else:
+            return None
+        
+        if cls._FORBIDDEN_AC is not None:
+            # Normalized query has single spaces, so multi-word keywords match
+            # literally; only the word boundaries need checking by hand.
+            last = len(query) - 1
+            for end, keyword in cls._FORBIDDEN_AC.iter(query):
+                start = end - len(keyword) + 1
+                if start > 0 and _is_word_char(query[start - 1]):
+                    continue
+                if end < last and _is_word_char(query[end + 1]):
+                    continue
                 return keyword
-        return None
+            return None
+        
+        # Single pass over the query; word boundaries avoid false positives
+        match = cls._FORBIDDEN_RE.search(query)
+        return match.group(1) if match else None
     
     @classmethod
     def _validate_cte_query(cls, query: str) -> bool:
@@ -138,6 +265,134 @@ class QueryValidator:
         return 'SELECT' in query and query.rindex('SELECT') > query.index('WITH')
 
 
+# Queries at or above this length skip the validation cache
+_VALIDATION_CACHE_MAX_LEN = 8192
+
+# Hard limits checked before validation regexes run
+_MAX_QUERY_LENGTH = 65_536
+_MAX_BLOCK_COMMENTS = 32
+
+
+@functools.lru_cache(maxsize=1024)
+def _validate_query_cached(query: str) -> tuple[bool, str]:
+    """Memoized QueryValidator._validate for short, frequently repeated queries."""
+    return QueryValidator._validate(query)
+
+
+# ---------------------------------------------------------------------------
+# SQL identifier helpers
+# ---------------------------------------------------------------------------
+
+# Unquoted Snowflake identifiers resolve case-insensitively (stored uppercase)
+_SIMPLE_IDENTIFIER_RE = re.compile(r'^[A-Za-z_][A-Za-z0-9_$]*$')
+
+
+@functools.lru_cache(maxsize=256)
+def _quote_identifier(name: str) -> str:
+    """Quote a database/schema/table name for safe interpolation into SQL.
+    
+    Plain names are uppercased before quoting so `my_db` still resolves to
+    MY_DB, exactly as it would unquoted. Names already wrapped in double
+    quotes are passed through; anything else is quoted with embedded quotes
+    doubled, so the name can never terminate the identifier early.
+    """
+    if _SIMPLE_IDENTIFIER_RE.match(name):
+        return f'"{name.upper()}"'
+    if len(name) > 1 and name[0] == name[-1] == '"' and '"' not in name[1:-1].replace('""', ''):
+        return name
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _qualify(*names: str) -> str:
+    """Build a quoted, dot-separated object name (e.g. "DB"."SCHEMA")."""
+    return ".".join(_quote_identifier(name) for name in names)
+
+
+# ---------------------------------------------------------------------------
+# Result fetching helpers
+# ---------------------------------------------------------------------------
+
+# Reused msgspec encoder; str() covers types it has no native encoding for
+_MSGSPEC_ENCODER = msgspec.json.Encoder(enc_hook=str) if msgspec is not None else None
+
+# Types msgspec writes in its own format where orjson (and the json
+# fallback) use str(): base64 for binary data, ISO durations for timedeltas
+_MSGSPEC_OWN_FORMAT = (bytes, bytearray, memoryview, timedelta)
+
+
+def _json_default(value: Any) -> Any:
+    """json fallback for other types, matching orjson: ISO 8601 dates/times, else str()."""
+    return value.isoformat() if hasattr(value, "isoformat") else str(value)
+
+
+def _needs_stdlib_json(rows: List[Dict[str, Any]], msgspec_types: bool) -> bool:
+    """Return True if the fast encoder would write some value differently from json.
+    
+    orjson and msgspec both turn NaN/Infinity into null. With msgspec_types,
+    values msgspec formats its own way (see _MSGSPEC_OWN_FORMAT, plus
+    "Z" instead of "+00:00" on UTC datetimes) count too.
+    """
+    for row in rows:
+        for value in row.values():
+            if isinstance(value, float):
+                if not math.isfinite(value):
+                    return True
+            elif msgspec_types and (
+                isinstance(value, _MSGSPEC_OWN_FORMAT)
+                or (isinstance(value, datetime) and value.tzinfo is not None)
+            ):
+                return True
+    return False
+
+
+def _dump_rows(rows: List[Dict[str, Any]]) -> str:
+    """Serialize result rows to indented JSON (orjson, then msgspec, then json).
+    
+    All three produce the same output. Rows the fast encoders can't write
+    that way (see _needs_stdlib_json) and ints wider than 64 bits, which
+    orjson rejects (NUMBER(38,0)), go through json.
+    """
+    if orjson is not None:
+        if not _needs_stdlib_json(rows, msgspec_types=False):
+            try:
+                # datetimes are native to orjson; str() covers Decimal and friends
+                return orjson.dumps(rows, option=orjson.OPT_INDENT_2, default=str).decode()
+            except orjson.JSONEncodeError:
+                pass
+    elif _MSGSPEC_ENCODER is not None and not _needs_stdlib_json(rows, msgspec_types=True):
+        return msgspec.json.format(_MSGSPEC_ENCODER.encode(rows), indent=2).decode()
+    return json.dumps(rows, indent=2, ensure_ascii=False, default=_json_default)
+
+
+def _fetch_arrow_rows(cursor, max_rows: int) -> tuple[List[Dict[str, Any]], bool]:
+    """Collect up to max_rows rows from the cursor's Arrow result batches.
+    
+    Batches stay columnar while streaming; only the rows we actually return
+    are converted to Python dicts at the end.
+    
+    Raises:
+        NotSupportedError: If the result set is not in Arrow format
+            (e.g. SHOW commands, which Snowflake returns as JSON).
+    
+    Returns:
+        tuple: (rows, has_more_rows)
+    """
+    tables = []
+    collected = 0
+    has_more = False
+    
+    for table in cursor.fetch_arrow_batches():
+        if collected + table.num_rows > max_rows:
+            tables.append(table.slice(0, max_rows - collected))
+            has_more = True
+            break
+        tables.append(table)
+        collected += table.num_rows
+    
+    rows = [row for table in tables for row in table.to_pylist()]
+    return rows, has_more
+
+
 # ---------------------------------------------------------------------------
 # SnowflakeMCPServer Class (with sophisticated features)
 # ---------------------------------------------------------------------------
@@ -163,6 +418,17 @@ class SnowflakeMCPServer:
         self._snowflake_config: Optional[SnowflakeConfig] = None
         self._server_config: Optional[ServerConfig] = None
         self.connection: Optional[snowflake.connector.SnowflakeConnection] = None
+        
+        # Serializes connect() so the startup warm-up and the first tool call
+        # don't both open a connection
+        self._connect_lock = asyncio.Lock()
+        
+        # Dedicated query thread pool + matching semaphore, created on first use
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._query_slots: Optional[asyncio.Semaphore] = None
+        
+        # In-process cache of recent results, created on first use
+        self._result_cache: Optional[TTLCache] = None
     
     # -------------------------------------------------------------------------
     # WHY LAZY INITIALIZATION?
@@ -187,46 +453,77 @@ class SnowflakeMCPServer:
     def snowflake_config(self) -> SnowflakeConfig:
         """Lazy-load Snowflake config on first access."""
         if self._snowflake_config is None:
-            self._snowflake_config = SnowflakeConfig.from_env()
+            self._snowflake_config = get_snowflake_config()
         return self._snowflake_config
     
     @property
     def server_config(self) -> ServerConfig:
         """Lazy-load server config on first access."""
         if self._server_config is None:
-            self._server_config = ServerConfig.from_env()
+            self._server_config = get_server_config()
             logger.setLevel(self._server_config.log_level)
         return self._server_config
     
+    @property
+    def executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """Lazy-create the thread pool that runs blocking Snowflake calls.
+        
+        A dedicated pool keeps queries from competing with other users of
+        asyncio's shared default executor.
+        """
+        if self._executor is None:
+            workers = self.server_config.max_concurrent_queries
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="sf-query"
+            )
+            # Bounds queued work to the pool size (backpressure)
+            self._query_slots = asyncio.Semaphore(workers)
+        return self._executor
+    
+    @property
+    def result_cache(self) -> Optional[TTLCache]:
+        """Lazy-create the local result cache (None when LOCAL_CACHE_TTL=0)."""
+        if self._result_cache is None and self.server_config.local_cache_ttl > 0:
+            self._result_cache = TTLCache(
+                maxsize=256, ttl=self.server_config.local_cache_ttl
+            )
+        return self._result_cache
+    
     # ----- Connection Management -----------------------------------------------
     
     async def connect(self) -> bool:
-        """Establish connection to Snowflake with health checks."""
-        try:
-            logger.info(f"🔍 Connection check - self.connection exists: {self.connection is not None}")
-            
-            if self.connection:
-                is_closed = self.connection.is_closed()
-                logger.info(f"🔍 Connection state - is_closed(): {is_closed}")
-                if not is_closed:
-                    logger.info("✅ Reusing existing healthy connection")
-                    return True
+        """Establish connection to Snowflake with health checks.
+        
+        The blocking connector call (TCP + TLS + auth) runs under
+        asyncio.to_thread so it never stalls the event loop.
+        """
+        async with self._connect_lock:
+            try:
+                logger.debug("🔍 Connection check - self.connection exists: %s", self.connection is not None)
+                
+                if self.connection:
+                    is_closed = self.connection.is_closed()
+                    logger.debug("🔍 Connection state - is_closed(): %s", is_closed)
+                    if not is_closed:
+                        logger.debug("✅ Reusing existing healthy connection")
+                        return True
+                    else:
+                        logger.info("❌ Connection exists but is closed, need to reconnect")
                 else:
-                    logger.info("❌ Connection exists but is closed, need to reconnect")
-            else:
-                logger.info("❌ No existing connection, creating new one")
-            
-            logger.info("🔗 Connecting to Snowflake...")
-            self.connection = snowflake.connector.connect(
-                **self.snowflake_config.to_connection_params()
-            )
-            logger.info("✅ Successfully connected to Snowflake")
-            return True
-            
-        except Exception as e:
-            logger.error(f"Failed to connect to Snowflake: {e}")
-            self.connection = None
-            return False
+                    logger.info("❌ No existing connection, creating new one")
+                
+                logger.info("🔗 Connecting to Snowflake...")
+                self.connection = await asyncio.to_thread(
+                    snowflake.connector.connect,
+                    **self.snowflake_config.to_connection_params(),
+                )
+                logger.info("✅ Successfully connected to Snowflake")
+                return True
+                
+            except Exception as e:
+                logger.error(f"Failed to connect to Snowflake: {e}")
+                self.connection = None
+                return False
     
     async def disconnect(self):
         """Close Snowflake connection."""
@@ -237,6 +534,11 @@ class SnowflakeMCPServer:
             except Exception as e:
                 logger.error(f"Error closing connection: {e}")
         self.connection = None
+        
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+            self._query_slots = None
     
     # ----- Query Execution -----------------------------------------------------
     
@@ -258,7 +560,29 @@ class SnowflakeMCPServer:
         
         Returns:
             Dict with columns, rows, row_count, query_id, has_more_rows, max_rows_returned
+        
+        When disable_cache is False and no query_tag is given, results are also
+        kept in a short-lived local cache, so a repeated query skips Snowflake
+        entirely (not just Snowflake's own result cache, which still costs a
+        round-trip). Cache hits come back as a copy with ``cached=True``; their
+        query_id and query_tag are from the run that filled the cache.
         """
+        # Local cache only when the caller allows cached results and hasn't
+        # asked for a tag (a tagged query must actually run to be findable).
+        cache = self.result_cache if not disable_cache and not query_tag else None
+        cache_key = None
+        if cache is not None:
+            cache_key = hashlib.blake2b(query.encode(), digest_size=16).digest()
+            cached = cache.get(cache_key)
+            if cached is not None:
+                # Copy, so callers can't modify the cached entry. query_id and
+                # query_tag still belong to the run that filled the cache.
+                return {
+                    **cached,
+                    "rows": [dict(row) for row in cached["rows"]],
+                    "cached": True,
+                }
+        
         if not await self.connect():
             raise Exception("Could not establish connection to Snowflake")
         
@@ -267,12 +591,15 @@ class SnowflakeMCPServer:
         
         # Auto-generate query tag if not provided
         if not query_tag:
-            query_tag = f"mcp_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')[:-3]}"
+            query_tag = _QUERY_TAG_PREFIX + str(next(_query_tag_counter))
         
         try:
             result = await self._execute_query_with_options(
                 query, query_timeout, query_tag, disable_cache
             )
+            if cache is not None:
+                # Store a copy: the caller gets result itself and may modify it
+                cache[cache_key] = {**result, "rows": [dict(row) for row in result["rows"]]}
             return result
             
         except Exception as e:
@@ -294,19 +621,33 @@ class SnowflakeMCPServer:
     ) -> Dict[str, Any]:
         """Execute query with session options (tag, cache control, timeout)."""
         
-        def _run_query():
-            cursor = self.connection.cursor(DictCursor)
+        # Resolve per-call constants up front and bind them as default
+        # arguments, so the worker thread does plain local lookups instead
+        # of closure-cell and attribute lookups on self.
+        #
+        # Query tag and cache control are sent as statement-level
+        # parameters with the query itself, so no ALTER SESSION
+        # round-trips are needed before or after it.
+        statement_params = {"QUERY_TAG": query_tag}
+        if disable_cache:
+            statement_params["USE_CACHED_RESULT"] = "FALSE"
+        
+        def _run_query(
+            conn=self.connection,
+            max_rows=self.server_config.max_query_rows,
+            statement_params=statement_params,
+            query=query,
+            timeout_seconds=timeout_seconds,
+            query_tag=query_tag,
+        ):
+            cursor = conn.cursor(DictCursor)
             try:
-                # Set cache control if disabled
-                if disable_cache:
-                    cursor.execute("ALTER SESSION SET USE_CACHED_RESULT = FALSE")
-                
-                # Set query tag
-                escaped_tag = query_tag.replace("'", "''")
-                cursor.execute(f"ALTER SESSION SET QUERY_TAG = '{escaped_tag}'")
-                
                 # Execute main query with timeout
-                cursor.execute(query, timeout=timeout_seconds)
+                cursor.execute(
+                    query,
+                    timeout=timeout_seconds,
+                    _statement_params=statement_params,
+                )
                 
                 # Capture query ID immediately after execution
                 query_id = getattr(cursor, 'sfqid', None)
@@ -314,32 +655,40 @@ class SnowflakeMCPServer:
                 # Get column information
                 columns = [desc[0] for desc in cursor.description] if cursor.description else []
                 
-                # Fetch results with row limit
-                rows = cursor.fetchmany(self.server_config.max_query_rows)
-                
-                # Check if there are more rows
-                has_more = len(cursor.fetchmany(1)) > 0
+                # Fetch results with row limit - Arrow batches when possible
+                rows = None
+                if _HAS_PYARROW and cursor.description:
+                    try:
+                        rows, has_more = _fetch_arrow_rows(cursor, max_rows)
+                    except NotSupportedError:
+                        # JSON result format - use the row-based path below
+                        rows = None
                 
-                # Reset session settings
-                cursor.execute("ALTER SESSION SET QUERY_TAG = NULL")
-                if disable_cache:
-                    cursor.execute("ALTER SESSION SET USE_CACHED_RESULT = TRUE")
+                if rows is None:
+                    # Fetch one extra row in the same call to detect overflow,
+                    # instead of probing with a second fetchmany(1)
+                    rows = cursor.fetchmany(max_rows + 1)
+                    has_more = len(rows) > max_rows
+                    del rows[max_rows:]
                 
                 return {
                     "columns": columns,
                     "rows": rows,
                     "row_count": len(rows),
                     "has_more_rows": has_more,
-                    "max_rows_returned": self.server_config.max_query_rows,
+                    "max_rows_returned": max_rows,
                     "query_id": query_id,
                     "query_tag": query_tag
                 }
             finally:
                 cursor.close()
         
-        # Run the synchronous query in a thread pool to avoid blocking the event loop
+        # Run the synchronous query in our thread pool to avoid blocking the
+        # event loop; the semaphore caps how many queries are in flight.
+        executor = self.executor
         loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, _run_query)
+        async with self._query_slots:
+            return await loop.run_in_executor(executor, _run_query)
 
 
 # ---------------------------------------------------------------------------
@@ -350,129 +699,134 @@ snowflake_server = SnowflakeMCPServer()
 server = Server("SnowflakeMCP")
 
 
-@server.list_tools()
-async def handle_list_tools() -> list[types.Tool]:
-    """
-    List available tools.
-    
-    Exposes execute_query with all parameters matching sophisticated server.
-    """
-    return [
-        types.Tool(
-            name="execute_query",
-            description=(
-                "Execute a read-only SQL query on Snowflake database. "
-                "Supports SELECT, WITH (CTEs), SHOW, DESCRIBE, EXPLAIN commands."
-            ),
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "SQL query to execute (read-only operations only)"
-                    },
-                    "timeout_seconds": {
-                        "type": "integer",
-                        "description": "Optional timeout in seconds for this query (overrides default timeout). Use for long-running queries or to set shorter timeouts.",
-                        "minimum": 1,
-                        "maximum": 3600
-                    },
-                    "query_tag": {
-                        "type": "string",
-                        "description": "Optional tag to identify this query for later analysis. Use descriptive tags like 'before_optimization', 'dashboard_query_1', or JSON strings like '{\"type\":\"test\",\"phase\":\"before\"}'. Makes it easy to find queries later for performance comparison."
-                    },
-                    "disable_cache": {
-                        "type": "boolean",
-                        "description": "Whether to disable Snowflake result caching for this query (default: true). Set to false only if you want to allow cached results. Disabling cache ensures accurate performance measurements for comparisons."
-                    }
+# Tool definitions are static, so build (and validate) them once at import
+# rather than on every list_tools request.
+_TOOLS: list[types.Tool] = [
+    types.Tool(
+        name="execute_query",
+        description=(
+            "Execute a read-only SQL query on Snowflake database. "
+            "Supports SELECT, WITH (CTEs), SHOW, DESCRIBE, EXPLAIN commands."
+        ),
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "SQL query to execute (read-only operations only)"
+                },
+                "timeout_seconds": {
+                    "type": "integer",
+                    "description": "Optional timeout in seconds for this query (overrides default timeout). Use for long-running queries or to set shorter timeouts.",
+                    "minimum": 1,
+                    "maximum": 3600
+                },
+                "query_tag": {
+                    "type": "string",
+                    "description": "Optional tag to identify this query for later analysis. Use descriptive tags like 'before_optimization', 'dashboard_query_1', or JSON strings like '{\"type\":\"test\",\"phase\":\"before\"}'. Makes it easy to find queries later for performance comparison."
                 },
-                "required": ["query"]
+                "disable_cache": {
+                    "type": "boolean",
+                    "description": "Whether to disable Snowflake result caching for this query (default: true). Set to false only if you want to allow cached results. Disabling cache ensures accurate performance measurements for comparisons."
+                }
             },
-        ),
+            "required": ["query"]
+        },
+    ),
 
-        types.Tool(
-            name="list_databases",
-            description="List all databases in Snowflake",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
+    types.Tool(
+        name="list_databases",
+        description="List all databases in Snowflake",
+        inputSchema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
 
-        types.Tool(
-            name = "list_schemas",
-            description="List all schemas in a database",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "database": {"type": "string", "description": "Database name"},
-                },
-                "required": ["database"]
-            }
-        ),
+    types.Tool(
+        name = "list_schemas",
+        description="List all schemas in a database",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "database": {"type": "string", "description": "Database name"},
+            },
+            "required": ["database"]
+        }
+    ),
 
-        types.Tool(
-            name="list_tables",
-            description="List all tables in a database schema",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "database": {
-                        "type": "string",
-                        "description": "Database name"
-                    },
-                    "schema": {
-                        "type": "string",
-                        "description": "Schema name"
-                    }
+    types.Tool(
+        name="list_tables",
+        description="List all tables in a database schema",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "database": {
+                    "type": "string",
+                    "description": "Database name"
                 },
-                "required": ["database", "schema"]
+                "schema": {
+                    "type": "string",
+                    "description": "Schema name"
+                }
             },
-        ),
+            "required": ["database", "schema"]
+        },
+    ),
 
-        types.Tool(
-            name="describe_table",
-            description="Describe a table in a database schema",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "database": {
-                        "type": "string",
-                        "description": "Database name"
-                    },
-                    "schema": {
-                        "type": "string",
-                        "description": "Schema name"
-                    },
-                    "table": {
-                        "type": "string",
-                        "description": "Table name"
-                    }
+    types.Tool(
+        name="describe_table",
+        description="Describe a table in a database schema",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "database": {
+                    "type": "string",
+                    "description": "Database name"
                 },
-                "required": ["database", "schema", "table"]
+                "schema": {
+                    "type": "string",
+                    "description": "Schema name"
+                },
+                "table": {
+                    "type": "string",
+                    "description": "Table name"
+                }
             },
-        ),
+            "required": ["database", "schema", "table"]
+        },
+    ),
 
-        types.Tool(
-            name="check_database_exists",
-            description="Validate that a database exists and is accessible. Optionally check a specific schema within the database.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "database": {
-                        "type": "string",
-                        "description": "Database name to check"
-                    },
-                    "schema": {
-                        "type": "string",
-                        "description": "Optional schema name to also verify within the database"
-                    }
+    types.Tool(
+        name="check_database_exists",
+        description="Validate that a database exists and is accessible. Optionally check a specific schema within the database.",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "database": {
+                    "type": "string",
+                    "description": "Database name to check"
                 },
-                "required": ["database"]
+                "schema": {
+                    "type": "string",
+                    "description": "Optional schema name to also verify within the database"
+                }
             },
-        )
-    ]
+            "required": ["database"]
+        },
+    )
+]
+
+
+@server.list_tools()
+async def handle_list_tools() -> list[types.Tool]:
+    """
+    List available tools.
+    
+    Exposes execute_query with all parameters matching sophisticated server.
+    """
+    return _TOOLS
 
 
 @server.call_tool()
@@ -508,38 +862,48 @@ async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent
                 disable_cache=disable_cache
             )
             
-            # Format results for display (matching sophisticated server format)
-            output = f"Query executed successfully!\n\n"
+            # Format results for display (matching sophisticated server format).
+            # Fragments are collected and joined once at the end.
+            parts = ["Query executed successfully!\n\n"]
             
-            # Show query ID (most important for performance analysis)
-            if result.get('query_id'):
-                output += f"Query ID: {result['query_id']}\n"
-            
-            # Show query tag
-            output += f"Query tag: {result['query_tag']}\n"
+            if result.get('cached'):
+                # Served from the local cache: nothing ran in Snowflake, so
+                # the ID and tag are those of the earlier run
+                parts.append("Served from local result cache (no query was run)\n")
+                if result.get('query_id'):
+                    parts.append(f"Original query ID: {result['query_id']}\n")
+                parts.append(f"Original query tag: {result['query_tag']}\n")
+            else:
+                # Show query ID (most important for performance analysis)
+                if result.get('query_id'):
+                    parts.append(f"Query ID: {result['query_id']}\n")
+                
+                # Show query tag
+                parts.append(f"Query tag: {result['query_tag']}\n")
             
             # Show cache status
             cache_status = "DISABLED" if disable_cache else "ENABLED"
-            output += f"Result cache: {cache_status}\n"
+            parts.append(f"Result cache: {cache_status}\n")
             
             # Show timeout information
             actual_timeout = timeout_seconds if timeout_seconds is not None else snowflake_server.snowflake_config.timeout
-            output += f"Timeout: {actual_timeout} seconds ({actual_timeout/60:.1f} minutes)\n"
-            output += f"Columns: {', '.join(result['columns'])}\n"
-            output += f"Rows returned: {result['row_count']}\n"
+            parts.append(f"Timeout: {actual_timeout} seconds ({actual_timeout/60:.1f} minutes)\n")
+            parts.append(f"Columns: {', '.join(result['columns'])}\n")
+            parts.append(f"Rows returned: {result['row_count']}\n")
             
             if result['has_more_rows']:
-                output += f"⚠️  Results limited to {result['max_rows_returned']} rows. Query returned more data.\n"
+                parts.append(f"⚠️  Results limited to {result['max_rows_returned']} rows. Query returned more data.\n")
             
-            output += "\nResults:\n"
-            output += json.dumps(result['rows'], indent=2, default=str)
+            parts.append("\nResults:\n")
+            parts.append(_dump_rows(result['rows']))
             
-            return [types.TextContent(type="text", text=output)]
+            return [types.TextContent(type="text", text="".join(parts))]
 
         elif name == "list_databases":
             query = "SHOW DATABASES"
             result = await snowflake_server.execute_query(
                 query=query,
+                disable_cache=False,
             )
 
             databases = [row.get('name', '') for row in result['rows']]
@@ -553,9 +917,10 @@ async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent
             if not database:
                 raise ValueError("Database is required")
 
-            query = f"SHOW SCHEMAS IN DATABASE {database}"
+            query = f"SHOW SCHEMAS IN DATABASE {_qualify(database)}"
             result = await snowflake_server.execute_query(
                 query=query,
+                disable_cache=False,
             )
             schemas = [row.get('name', '') for row in result['rows']]
             output = f"Available schemas ({len(schemas)}) in database {database}:\n"
@@ -568,20 +933,20 @@ async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent
             if not database or not schema:
                 raise ValueError("Both database and schema names are required")
             
-            query = f"SHOW TABLES IN SCHEMA {database}.{schema}"
-            result = await snowflake_server.execute_query(query=query)
+            query = f"SHOW TABLES IN SCHEMA {_qualify(database, schema)}"
+            result = await snowflake_server.execute_query(query=query, disable_cache=False)
             
             tables = []
             for row in result['rows']:
                 table_info = f"• {row.get('name', '')} ({row.get('kind', 'TABLE')})"
                 if row.get('comment'):
-                    table_info += f" - {row.get('comment')}"
+                    table_info = f"{table_info} - {row.get('comment')}"
                 tables.append(table_info)
             
-            output = f"Tables in {database}.{schema} ({len(tables)}):\n"
-            output += "\n".join(tables)
+            parts = [f"Tables in {database}.{schema} ({len(tables)}):\n"]
+            parts.append("\n".join(tables))
             
-            return [types.TextContent(type="text", text=output)]
+            return [types.TextContent(type="text", text="".join(parts))]
 
         elif name == "describe_table":
             database = arguments.get("database")
@@ -590,17 +955,17 @@ async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent
             if not database or not schema or not table:
                 raise ValueError("Both database, schema and table names are required")
             
-            query = f"DESCRIBE TABLE {database}.{schema}.{table}"
-            result = await snowflake_server.execute_query(query=query)
+            query = f"DESCRIBE TABLE {_qualify(database, schema, table)}"
+            result = await snowflake_server.execute_query(query=query, disable_cache=False)
 
             # 1. Header with table name
-            output = f"Structure of table {database}.{schema}.{table}:\n\n"
+            parts = [f"Structure of table {database}.{schema}.{table}:\n\n"]
             
             # 2. Column headers (with fixed widths for alignment)
-            output += f"{'Column':<30} {'Type':<20} {'Null?':<8} {'Default':<15} {'Comment'}\n"
+            parts.append(f"{'Column':<30} {'Type':<20} {'Null?':<8} {'Default':<15} {'Comment'}\n")
             
             # 3. Separator line
-            output += "-" * 90 + "\n"
+            parts.append("-" * 90 + "\n")
             
             # 4. Loop through each row
             for row in result['rows']:
@@ -610,10 +975,10 @@ async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent
                 default = str(row.get('default', '') or '')[:14]
                 comment = str(row.get('comment', '') or '')
                 
-                output += f"{name:<30} {data_type:<20} {nullable:<8} {default:<15} {comment}\n"
+                parts.append(f"{name:<30} {data_type:<20} {nullable:<8} {default:<15} {comment}\n")
             
-            # 5. Return
-            return [types.TextContent(type="text", text=output)]
+            # 5. Join once and return
+            return [types.TextContent(type="text", text="".join(parts))]
 
         elif name == "check_database_exists":
             database = arguments.get("database")
@@ -621,24 +986,36 @@ async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent
             if not database:
                 raise ValueError("Database name is required")
             
-            # Test database access by listing schemas
+            # Test database access by listing schemas (and schema access by
+            # listing its tables). SHOW commands are metadata-only, so they
+            # need no running warehouse; the two are independent, so they
+            # run concurrently instead of one after the other.
             try:
-                test_query = f"SHOW SCHEMAS IN DATABASE {database}"
-                result = await snowflake_server.execute_query(test_query)
+                checks = [snowflake_server.execute_query(
+                    f"SHOW SCHEMAS IN DATABASE {_qualify(database)}", disable_cache=False
+                )]
+                if schema:
+                    checks.append(snowflake_server.execute_query(
+                        f"SHOW TABLES IN SCHEMA {_qualify(database, schema)}", disable_cache=False
+                    ))
+                result, *schema_results = await asyncio.gather(*checks, return_exceptions=True)
+                if isinstance(result, BaseException):
+                    raise result
                 schema_count = len(result['rows'])
                 
                 output = f"✅ Database '{database}' exists and is accessible.\n"
                 output += f"   Found {schema_count} schemas in this database.\n\n"
                 
-                # If schema provided, also test schema access
+                # If schema provided, also report schema access
                 if schema:
-                    try:
-                        schema_test = f"SHOW TABLES IN SCHEMA {database}.{schema}"
-                        schema_result = await snowflake_server.execute_query(schema_test)
+                    schema_result = schema_results[0]
+                    if isinstance(schema_result, Exception):
+                        output += f"⚠️  Schema '{schema}' may not be accessible: {str(schema_result)}\n\n"
+                    elif isinstance(schema_result, BaseException):
+                        raise schema_result
+                    else:
                         table_count = len(schema_result['rows'])
                         output += f"✅ Schema '{schema}' is accessible with {table_count} tables.\n\n"
-                    except Exception as e:
-                        output += f"⚠️  Schema '{schema}' may not be accessible: {str(e)}\n\n"
                 
                 output += f"💡 To query this database, use fully qualified names like:\n"
                 output += f"   SELECT * FROM {database}.schema_name.table_name"
@@ -675,10 +1052,16 @@ async def main() -> None:
         ),
     )
 
+    # Warm up the Snowflake connection so the TLS/auth round trips overlap
+    # with the MCP handshake instead of delaying the first tool call
+    warmup = asyncio.create_task(snowflake_server.connect())
+
     try:
         async with mcp_stdio.stdio_server() as (read, write):
             await server.run(read, write, options)
     finally:
+        if not warmup.done():
+            warmup.cancel()
         # Clean up connection on exit
         await snowflake_server.disconnect()
 
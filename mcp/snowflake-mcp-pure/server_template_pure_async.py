@@ -28,6 +28,7 @@
 """
 
 import asyncio
+from typing import Awaitable, Callable
 from mcp.server import Server, NotificationOptions
 from mcp.server import stdio as mcp_stdio
 from mcp.server.models import InitializationOptions
@@ -47,31 +48,37 @@ server = Server("MyMCPServer")
 # ═══════════════════════════════════════════════════════════════════════════════
 # Called when client sends: {"method": "tools/list"}
 # Returns all available tools with their JSON schemas.
+#
+# The Tool objects are built once at import and the same list is returned on
+# every request - no need to rebuild (and re-validate) them per call.
+
+_TOOLS: list[types.Tool] = [
+    types.Tool(
+        name="my_tool",
+        description="Description of what this tool does (shown to LLM)",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "param1": {
+                    "type": "string",
+                    "description": "Description of param1",
+                },
+                # Add more parameters as needed:
+                # "param2": {"type": "integer", "description": "..."},
+                # "param3": {"type": "boolean", "description": "..."},
+            },
+            "required": ["param1"],  # List required parameters
+        },
+    ),
+    # Add more tools here:
+    # types.Tool(name="another_tool", description="...", inputSchema={...}),
+]
+
 
 @server.list_tools()
 async def handle_list_tools() -> list[types.Tool]:
     """Return list of available tools with their schemas."""
-    return [
-        types.Tool(
-            name="my_tool",
-            description="Description of what this tool does (shown to LLM)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "param1": {
-                        "type": "string",
-                        "description": "Description of param1",
-                    },
-                    # Add more parameters as needed:
-                    # "param2": {"type": "integer", "description": "..."},
-                    # "param3": {"type": "boolean", "description": "..."},
-                },
-                "required": ["param1"],  # List required parameters
-            },
-        ),
-        # Add more tools here:
-        # types.Tool(name="another_tool", description="...", inputSchema={...}),
-    ]
+    return _TOOLS
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -79,28 +86,52 @@ async def handle_list_tools() -> list[types.Tool]:
 # ═══════════════════════════════════════════════════════════════════════════════
 # Called when client sends: {"method": "tools/call", "params": {"name": "...", "arguments": {...}}}
 # Dispatches to the correct tool and returns results.
+#
+# Each tool's logic lives in its own function, registered by name with
+# @register. Dispatch is then one dict lookup, however many tools you add
+# (instead of walking an if/elif chain of name comparisons).
+
+_HANDLERS: dict[str, Callable[[dict], Awaitable[list[types.TextContent]]]] = {}
+
+
+def register(name: str):
+    """Decorator: route tools/call requests for `name` to the decorated function."""
+    def decorator(func):
+        _HANDLERS[name] = func
+        return func
+    return decorator
+
+
+@register("my_tool")
+async def _my_tool(arguments: dict) -> list[types.TextContent]:
+    # Extract arguments
+    param1 = arguments.get("param1", "")
+    
+    # ─── YOUR TOOL LOGIC HERE ───
+    result = f"You called my_tool with: {param1}"
+    # ────────────────────────────
+
+    # The regular constructor is fine here: pydantic v2 validates in compiled
+    # code, and TextContent.model_construct() (which skips validation) is
+    # actually slower for a small model like this one.
+    return [types.TextContent(type="text", text=result)]
+
+
+# Add more tool handlers:
+# @register("another_tool")
+# async def _another_tool(arguments: dict) -> list[types.TextContent]:
+#     ...
+#     return [types.TextContent(type="text", text=result)]
+
 
 @server.call_tool()
 async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent]:
     """Dispatch and execute tool calls."""
-    
-    if name == "my_tool":
-        # Extract arguments
-        param1 = arguments.get("param1", "")
-        
-        # ─── YOUR TOOL LOGIC HERE ───
-        result = f"You called my_tool with: {param1}"
-        # ────────────────────────────
-        
-        return [types.TextContent(type="text", text=result)]
-    
-    # Add more tool handlers:
-    # elif name == "another_tool":
-    #     ...
-    #     return [types.TextContent(type="text", text=result)]
-    
-    # Unknown tool
-    raise ValueError(f"Unknown tool: {name}")
+    handler = _HANDLERS.get(name)
+    if handler is None:
+        # Unknown tool
+        raise ValueError(f"Unknown tool: {name}")
+    return await handler(arguments)
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -111,7 +142,8 @@ async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent
 async def main() -> None:
     """Set up and run the MCP server."""
     
-    # Server initialization options
+    # Server initialization options (built once per process, after the
+    # handlers above are registered, so get_capabilities() can see them)
     options = InitializationOptions(
         server_name="MyMCPServer",
         server_version="0.1.0",
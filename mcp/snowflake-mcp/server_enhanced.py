@@ -2,11 +2,12 @@
 Snowflake MCP Server (stdio transport) - Enhanced with Class Structure
 -----------------------------------------------------------------------
 
-This file defines a single MCP tool:
+This file defines two MCP tools:
 
     run_query(sql: str) -> { columns, row_count, rows }
+    run_queries(sqls: list[str]) -> [ { columns, row_count, rows } | { error }, ... ]
 
-The tool:
+The tools:
   - Connects to Snowflake using credentials in environment variables / .env
   - Only allows *read‑only* SQL (SELECT / WITH / SHOW / DESCRIBE / EXPLAIN)
   - Returns query results as a list of row dictionaries
@@ -24,12 +25,38 @@ MCP-wise, you can think of this as:
 """
 
 import os
-from typing import Any, Dict, List, Optional
+import json
+import math
+import queue
+import asyncio
+import threading
+import concurrent.futures
+import importlib.util
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
 
-import snowflake.connector
+from cachetools import TTLCache
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
 
+# Optional: fetch results as Arrow batches when pyarrow is available
+# (pip install "snowflake-connector-python[pandas]"). Checked without
+# importing, since the connector loads pyarrow itself when needed.
+_HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+# Optional: orjson (C extension) for serializing results. Falls back to the
+# stdlib json module if missing.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# snowflake.connector (and the cryptography / urllib3 stack it pulls in) is
+# imported on the first connection rather than here, so the server starts up
+# and answers the MCP handshake without paying for it.
+if TYPE_CHECKING:
+    from snowflake.connector import SnowflakeConnection
+
 
 # Load environment variables from .env file
 load_dotenv()
@@ -42,10 +69,59 @@ load_dotenv()
 class SnowflakeMCPServer:
     """Snowflake MCP Server class that encapsulates connection and query logic."""
     
+    # Optional connect() kwargs and the environment variables they come from
+    _OPTIONAL_ENV = (
+        ("role", "SNOWFLAKE_ROLE"),
+        ("warehouse", "SNOWFLAKE_WAREHOUSE"),
+        ("database", "SNOWFLAKE_DATABASE"),
+        ("schema", "SNOWFLAKE_SCHEMA"),
+    )
+    
+    # Status polling backoff for execute_query_async, in seconds
+    POLL_INTERVAL_MIN = 0.05
+    POLL_INTERVAL_MAX = 1.0
+    
     def __init__(self):
         """Initialize the server with configuration."""
         # Read-only SQL prefixes - stored as instance variable
         self.read_only_prefixes = ("SELECT", "WITH", "SHOW", "DESCRIBE", "EXPLAIN")
+        
+        # The same prefixes as a set for one hash lookup on the first keyword,
+        # plus the longest one to bound how far is_read_only_sql scans
+        self._read_only_set = frozenset(self.read_only_prefixes)
+        self._read_only_max_len = max(map(len, self.read_only_prefixes))
+        
+        # Pool of authenticated connections, filled lazily up to pool_size.
+        # Handing connections back and forth avoids paying the TLS + auth
+        # handshake on every query.
+        self.pool_size = self._get_positive_int_env("SNOWFLAKE_POOL_SIZE", 4)
+        
+        # Rows fetched per fetchmany() call while building results
+        self.fetch_batch_size = int(os.getenv("SNOWFLAKE_FETCH_BATCH_SIZE") or 10_000)
+        self._pool: "queue.Queue[SnowflakeConnection]" = queue.Queue()
+        self._pool_created = 0
+        self._pool_lock = threading.Lock()
+        
+        # Async callers wait for a pool slot here, on the event loop, rather
+        # than blocking a worker thread in _pool.get(): those threads are
+        # needed by in-flight queries to poll their status.
+        self._async_slots = asyncio.Semaphore(self.pool_size)
+        
+        # Short-lived cache of results for repeated identical queries (read-only
+        # SQL is idempotent within a short window). MCP_QUERY_TTL=0 disables it.
+        cache_size = int(os.getenv("MCP_QUERY_CACHE") or 256)
+        cache_ttl = int(os.getenv("MCP_QUERY_TTL") or 30)
+        self._result_cache: Optional[TTLCache] = (
+            TTLCache(maxsize=cache_size, ttl=cache_ttl) if cache_size > 0 and cache_ttl > 0 else None
+        )
+        self._result_cache_lock = threading.Lock()
+        
+        # connect() kwargs, resolved from the environment on first use (not
+        # here, so the module can be imported without credentials set)
+        self._conn_kwargs: Optional[Dict[str, Any]] = None
+        
+        # The snowflake.connector module, imported by the first connect
+        self._connector = None
     
     def _get_required_env(self, name: str) -> str:
         """Return an environment variable or raise a clear error if missing.
@@ -64,16 +140,47 @@ class SnowflakeMCPServer:
             raise RuntimeError(f"Missing required environment variable: {name}")
         return value
     
-    def get_snowflake_connection(self) -> snowflake.connector.SnowflakeConnection:
+    def _get_positive_int_env(self, name: str, default: int) -> int:
+        """Return an integer environment variable that must be at least 1.
+        
+        Args:
+            name: Environment variable name to retrieve
+            default: Value to use when the variable is unset or empty
+            
+        Returns:
+            The parsed value
+            
+        Raises:
+            RuntimeError: If the value is below 1 (a pool of that size could
+                never hand out a connection, so calls would hang)
+        """
+        value = int(os.getenv(name) or default)
+        if value < 1:
+            raise RuntimeError(f"{name} must be at least 1, got {value}")
+        return value
+    
+    def get_snowflake_connection(self) -> "SnowflakeConnection":
         """Create a *new* Snowflake connection using environment variables.
         
-        We intentionally create a new connection per call (instead of a global,
-        long‑lived connection) to keep things simple and robust for a first MCP
-        server.
+        Queries don't call this directly; they borrow connections from the
+        pool (see _acquire_connection), which calls this to fill itself.
         
         Returns:
             A new Snowflake connection object
             
+        Raises:
+            RuntimeError: If required environment variables are missing
+        """
+        if self._conn_kwargs is None:
+            self._conn_kwargs = self._build_connection_kwargs()
+        if self._connector is None:
+            import snowflake.connector
+            self._connector = snowflake.connector
+        return self._connector.connect(**self._conn_kwargs)
+    
+    def _build_connection_kwargs(self) -> Dict[str, Any]:
+        """Read connection settings from the environment (done once, then reused).
+        
         Raises:
             RuntimeError: If required environment variables are missing
         """
@@ -86,14 +193,62 @@ class SnowflakeMCPServer:
         
         # Optional configuration – we only add these if they are set.
         # (Snowflake is fine with them being omitted.)
-        optional_keys = ["role", "warehouse", "database", "schema"]
-        for key in optional_keys:
-            env_name = f"SNOWFLAKE_{key.upper()}"
+        for key, env_name in self._OPTIONAL_ENV:
             value = os.getenv(env_name)
             if value:
                 kwargs[key] = value
         
-        return snowflake.connector.connect(**kwargs)
+        return kwargs
+    
+    def _acquire_connection(self) -> "SnowflakeConnection":
+        """Borrow a connection from the pool, opening one if below pool_size.
+        
+        Blocks until a connection is returned when the pool is exhausted.
+        """
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                can_create = self._pool_created < self.pool_size
+                if can_create:
+                    self._pool_created += 1
+            if can_create:
+                try:
+                    return self.get_snowflake_connection()
+                except Exception:
+                    with self._pool_lock:
+                        self._pool_created -= 1
+                    raise
+            conn = self._pool.get()
+        
+        # Replace connections that were closed while sitting in the pool
+        if conn.is_closed():
+            with self._pool_lock:
+                self._pool_created -= 1
+            return self._acquire_connection()
+        return conn
+    
+    def _release_connection(self, conn: "SnowflakeConnection") -> None:
+        """Return a borrowed connection to the pool (or drop it if closed)."""
+        if conn.is_closed():
+            with self._pool_lock:
+                self._pool_created -= 1
+            return
+        self._pool.put(conn)
+    
+    def close(self) -> None:
+        """Close all idle pooled connections (call on shutdown)."""
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            with self._pool_lock:
+                self._pool_created -= 1
+            try:
+                conn.close()
+            except Exception:
+                pass
     
     def is_read_only_sql(self, sql: str) -> bool:
         """Return True if the SQL *appears* read‑only based on its first keyword.
@@ -107,29 +262,44 @@ class SnowflakeMCPServer:
         Returns:
             True if the query appears to be read-only, False otherwise
         """
-        # Strip leading whitespace and grab the first word (if any).
-        first_token = sql.lstrip().split(maxsplit=1)[0].upper() if sql.strip() else ""
-        if not first_token:
-            return False
-        return any(first_token.startswith(prefix) for prefix in self.read_only_prefixes)
+        # Skip leading whitespace, then take the first word - but never read
+        # more than one character past the longest prefix: anything longer
+        # can't be an allowed keyword. Only that short slice is uppercased.
+        n = len(sql)
+        i = 0
+        while i < n and sql[i].isspace():
+            i += 1
+        limit = min(n, i + self._read_only_max_len + 1)
+        j = i
+        while j < limit and (sql[j].isalnum() or sql[j] == "_"):
+            j += 1
+        return sql[i:j].upper() in self._read_only_set
     
-    def execute_query(self, sql: str) -> Dict[str, Any]:
+    def execute_query(self, sql: str, columnar: bool = False) -> Dict[str, Any]:
         """Execute a read‑only SQL query against Snowflake.
         
         This method performs validation and executes the query, returning
-        structured results. A new connection is created for each call.
+        structured results. The connection is borrowed from the pool and
+        returned to it afterwards.
         
         Args:
             sql:
                 The SQL statement to execute. For safety, this must be a
                 read‑only statement whose first keyword is one of:
                 SELECT, WITH, SHOW, DESCRIBE, EXPLAIN.
+            columnar:
+                If True, return a columnar "data" list (one list of values
+                per column) instead of "rows". Avoids building a dict per row
+                and repeating every column name in each one.
         
         Returns:
             A dictionary with:
               - columns: list of column names (strings)
               - row_count: how many rows were returned
               - rows: list of dictionaries, one per row
+                (or, with columnar=True, data: list of column value lists)
+              - cached: True, only when the result was replayed from the
+                short-lived result cache (MCP_QUERY_TTL) instead of run
         
             Example:
                 {
@@ -141,35 +311,220 @@ class SnowflakeMCPServer:
                   ],
                 }
         
+            Columnar example:
+                {
+                  "columns": ["ID", "NAME"],
+                  "row_count": 2,
+                  "data": [[1, 2], ["Alice", "Bob"]],
+                }
+        
+        Raises:
+            ValueError: If the query is not read-only
+        """
+        self._check_read_only(sql)
+        
+        cache_key = (sql.strip(), columnar)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Borrow a pooled connection; the cursor is closed after each query
+        conn = self._acquire_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(sql)
+                result = self._build_result(cur, columnar)
+        finally:
+            self._release_connection(conn)
+        
+        self._cache_put(cache_key, result)
+        return result
+    
+    async def execute_query_async(self, sql: str, columnar: bool = False) -> Dict[str, Any]:
+        """Async variant of execute_query that doesn't hold a thread while waiting.
+        
+        The query is submitted with execute_async, which returns as soon as
+        Snowflake has accepted it. Its status is then polled with exponential
+        backoff (POLL_INTERVAL_MIN up to POLL_INTERVAL_MAX seconds), sleeping
+        on the event loop in between. Only the short submit/status/fetch calls
+        run in worker threads, so many long queries can be in flight without
+        one thread each.
+        
+        Args:
+            sql: Read‑only SQL statement (same rules as execute_query)
+            columnar: Return column lists instead of row dicts (see execute_query)
+        
+        Returns:
+            Same dictionary shape as execute_query.
+        
         Raises:
             ValueError: If the query is not read-only
         """
+        self._check_read_only(sql)
+        
+        cache_key = (sql.strip(), columnar)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
+        
+        async with self._async_slots:
+            result = await self._run_async(sql, columnar)
+        
+        self._cache_put(cache_key, result)
+        return result
+    
+    async def _run_async(self, sql: str, columnar: bool) -> Dict[str, Any]:
+        """Submit, poll and fetch one query; caller holds an async pool slot."""
+        conn = await asyncio.to_thread(self._acquire_connection)
+        try:
+            # A fresh cursor per query: execute_async doesn't reset a cursor's
+            # metadata, so a reused one could describe the previous query.
+            cur = conn.cursor()
+            try:
+                await asyncio.to_thread(cur.execute_async, sql)
+                query_id = cur.sfqid
+                
+                # Raises if the query failed; otherwise tells us if it's done
+                interval = self.POLL_INTERVAL_MIN
+                while conn.is_still_running(
+                    await asyncio.to_thread(conn.get_query_status_throw_if_error, query_id)
+                ):
+                    await asyncio.sleep(interval)
+                    interval = min(interval * 2, self.POLL_INTERVAL_MAX)
+                
+                def _fetch() -> Dict[str, Any]:
+                    # query_result() loads the finished query's result and
+                    # metadata (description) directly. get_results_from_sfqid()
+                    # would only install a prefetch hook - leaving description
+                    # unset until a fetch - and re-read the rows via RESULT_SCAN.
+                    cur.query_result(query_id)
+                    return self._build_result(cur, columnar)
+                
+                return await asyncio.to_thread(_fetch)
+            finally:
+                cur.close()
+        finally:
+            self._release_connection(conn)
+    
+    def _cache_get(self, key: tuple) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached result for key, or None (also when caching is off).
+        
+        The copy is marked ``cached: True``.
+        """
+        if self._result_cache is None:
+            return None
+        with self._result_cache_lock:
+            cached = self._result_cache.get(key)
+        if cached is None:
+            return None
+        result = self._copy_result(cached)
+        result["cached"] = True
+        return result
+    
+    def _cache_put(self, key: tuple, result: Dict[str, Any]) -> None:
+        """Remember a copy of a result for key until its TTL expires."""
+        if self._result_cache is None:
+            return
+        entry = self._copy_result(result)
+        with self._result_cache_lock:
+            self._result_cache[key] = entry
+    
+    @staticmethod
+    def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a result down to its row/column lists, so cache entries are never shared."""
+        copy = {**result, "columns": list(result["columns"])}
+        if "rows" in result:
+            copy["rows"] = [dict(row) for row in result["rows"]]
+        else:
+            copy["data"] = [list(column) for column in result["data"]]
+        return copy
+    
+    def _check_read_only(self, sql: str) -> None:
+        """Raise ValueError unless the SQL passes is_read_only_sql."""
         # Basic safety check to keep this tool read‑only.
         if not self.is_read_only_sql(sql):
             raise ValueError(
                 "Only read‑only queries are allowed. "
                 "Start your statement with SELECT, WITH, SHOW, DESCRIBE, or EXPLAIN."
             )
+    
+    def _build_result_from_arrow(self, cur, columns: List[str], columnar: bool) -> Dict[str, Any]:
+        """Build the result from Arrow record batches instead of row tuples.
         
-        # Open a *fresh* connection for each call.
-        # The context managers ensure the connection and cursor are closed cleanly.
-        with self.get_snowflake_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute(sql)
-                
-                # If the query returns rows (e.g. SELECT), build a list of dicts.
-                if cur.description:
-                    columns: List[str] = [col[0] for col in cur.description]
-                    raw_rows = cur.fetchall()
-                    rows: List[Dict[str, Any]] = [
-                        dict(zip(columns, row)) for row in raw_rows
-                    ]
-                else:
-                    # Some read‑only statements (e.g. certain SHOW commands)
-                    # might not return a traditional result set.
-                    columns = []
-                    rows = []
+        Values are decoded column-wise in C by pyarrow rather than as one
+        Python tuple per row by the connector.
+        
+        Raises:
+            NotSupportedError: If the result set is not in Arrow format.
+        """
+        batches = cur.fetch_arrow_batches()
+        
+        if columnar:
+            data: List[List[Any]] = [[] for _ in columns]
+            row_count = 0
+            for table in batches:
+                for column, values in zip(data, table.columns):
+                    column.extend(values.to_pylist())
+                row_count += table.num_rows
+            return {
+                "columns": columns,
+                "row_count": row_count,
+                "data": data,
+            }
+        
+        rows: List[Dict[str, Any]] = []
+        for table in batches:
+            rows.extend(table.to_pylist())
+        return {
+            "columns": columns,
+            "row_count": len(rows),
+            "rows": rows,
+        }
+    
+    def _build_result(self, cur, columnar: bool = False) -> Dict[str, Any]:
+        """Fetch all rows from an executed cursor into the tool's result shape."""
+        if not cur.description:
+            # Some read‑only statements (e.g. certain SHOW commands)
+            # might not return a traditional result set.
+            return {
+                "columns": [],
+                "row_count": 0,
+                "data" if columnar else "rows": [],
+            }
+        
+        columns: List[str] = [col[0] for col in cur.description]
+        
+        if _HAS_PYARROW:
+            # Already loaded by the connection that produced this cursor
+            from snowflake.connector.errors import NotSupportedError
+            try:
+                return self._build_result_from_arrow(cur, columns, columnar)
+            except NotSupportedError:
+                # JSON result format (e.g. SHOW commands) - use fetchmany below
+                pass
+        
+        # Fetch in batches and convert each one as it arrives, so the full
+        # set of raw driver tuples is never held alongside the converted rows.
+        batch_size = self.fetch_batch_size
         
+        if columnar:
+            # Transpose each batch of row tuples onto one list per column
+            data: List[List[Any]] = [[] for _ in columns]
+            row_count = 0
+            while batch := cur.fetchmany(batch_size):
+                for column, values in zip(data, zip(*batch)):
+                    column.extend(values)
+                row_count += len(batch)
+            return {
+                "columns": columns,
+                "row_count": row_count,
+                "data": data,
+            }
+        
+        # Default: build a list of dicts, one per row
+        rows: List[Dict[str, Any]] = []
+        while batch := cur.fetchmany(batch_size):
+            rows.extend(dict(zip(columns, row)) for row in batch)
         return {
             "columns": columns,
             "row_count": len(rows),
@@ -190,8 +545,59 @@ snowflake_server = SnowflakeMCPServer()
 # MCP server + tool definition
 # ---------------------------------------------------------------------------
 
+def _has_non_finite(value: Any) -> bool:
+    """Return True if a result holds a NaN or infinite float anywhere."""
+    if isinstance(value, float):
+        return not math.isfinite(value)
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, (list, tuple)):
+        return False
+    return any(_has_non_finite(item) for item in value)
+
+
+def _dump_result(result: Any) -> str:
+    """Serialize a query result (or list of results) to indented JSON (orjson when available)."""
+    # orjson silently writes NaN/Infinity as null and rejects ints wider
+    # than 64 bits (NUMBER(38,0)); those results go through json instead
+    if orjson is not None and not _has_non_finite(result):
+        try:
+            # datetimes are native to orjson; str() covers Decimal and friends
+            return orjson.dumps(result, option=orjson.OPT_INDENT_2, default=str).decode()
+        except orjson.JSONEncodeError:
+            pass
+    # Match orjson's output: ISO 8601 dates/times, str() for everything else
+    return json.dumps(
+        result,
+        indent=2,
+        ensure_ascii=False,
+        default=lambda value: value.isoformat() if hasattr(value, "isoformat") else str(value),
+    )
+
+
+@asynccontextmanager
+async def server_lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """Size the thread pool for Snowflake I/O on startup; close the pool on exit.
+    
+    asyncio.to_thread uses the loop's default executor, which is only
+    min(32, cpu_count + 4) threads. Snowflake calls spend nearly all their
+    time blocked on the network, so we allow MCP_THREAD_POOL_SIZE (default 64).
+    """
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(
+        concurrent.futures.ThreadPoolExecutor(
+            max_workers=int(os.getenv("MCP_THREAD_POOL_SIZE") or 64),
+            thread_name_prefix="mcp-sf",
+        )
+    )
+    try:
+        yield
+    finally:
+        snowflake_server.close()
+
+
 # Create the MCP server that will expose our Snowflake tool.
-mcp = FastMCP("SnowflakeMCP")
+mcp = FastMCP("SnowflakeMCP", lifespan=server_lifespan)
 
 
 # The @mcp.tool() decorator tells the MCP server:
@@ -203,8 +609,17 @@ mcp = FastMCP("SnowflakeMCP")
 # This function acts as a wrapper that calls the instance method on
 # snowflake_server. This allows us to use a class structure while still
 # working with FastMCP's function-based tool decorator.
-@mcp.tool()
-def run_query(sql: str) -> Dict[str, Any]:
+#
+# The tool is async: it submits the query asynchronously and polls for
+# completion, so the event loop (and the worker threads) stay free to serve
+# other requests while a query runs.
+#
+# The result is serialized to JSON text here rather than returned as a dict.
+# FastMCP has no hook for a custom encoder, and for a dict it would also
+# validate and re-dump the whole result as structured content; returning the
+# string with structured_output=False encodes the rows exactly once.
+@mcp.tool(structured_output=False)
+async def run_query(sql: str, columnar: bool = False) -> str:
     """Run a read‑only SQL query against Snowflake.
     
     Args:
@@ -212,12 +627,19 @@ def run_query(sql: str) -> Dict[str, Any]:
             The SQL statement to execute. For safety, this must be a
             read‑only statement whose first keyword is one of:
             SELECT, WITH, SHOW, DESCRIBE, EXPLAIN.
+        columnar:
+            Optional. If true, return "data" as one list of values per column
+            instead of "rows" as one dictionary per row. Much smaller for
+            large results.
     
     Returns:
-        A dictionary with:
+        A JSON object with:
           - columns: list of column names (strings)
           - row_count: how many rows were returned
           - rows: list of dictionaries, one per row
+            (or, with columnar=true, data: list of column value lists)
+          - cached: true, only when an identical query's result from the
+            last few seconds was replayed instead of running it again
     
         Example:
             {
@@ -229,8 +651,45 @@ def run_query(sql: str) -> Dict[str, Any]:
               ],
             }
     """
-    # Call the instance method on the snowflake_server instance
-    return snowflake_server.execute_query(sql)
+    # Call the async instance method on the snowflake_server instance
+    result = await snowflake_server.execute_query_async(sql, columnar)
+    return _dump_result(result)
+
+
+# Runs several statements in one tool call. They execute concurrently, capped
+# at the connection pool size by execute_query_async, so the total wall time
+# is roughly the slowest query rather than the sum of all of them - and the
+# client makes one round-trip instead of N.
+@mcp.tool(structured_output=False)
+async def run_queries(sqls: List[str], columnar: bool = False) -> str:
+    """Run several read‑only SQL queries against Snowflake concurrently.
+    
+    Args:
+        sqls:
+            The SQL statements to execute. Each must be read‑only, exactly
+            as for run_query.
+        columnar:
+            Optional. If true, each result uses "data" (one list of values
+            per column) instead of "rows".
+    
+    Returns:
+        A JSON list with one entry per statement, in the same order: either
+        a result object (as returned by run_query) or {"error": "..."} if
+        that statement failed. One failure doesn't affect the others.
+    """
+    results = await asyncio.gather(
+        *(snowflake_server.execute_query_async(sql, columnar) for sql in sqls),
+        return_exceptions=True,
+    )
+    for result in results:
+        # return_exceptions also captures CancelledError and other
+        # BaseExceptions; those abort the whole call rather than one entry
+        if isinstance(result, BaseException) and not isinstance(result, Exception):
+            raise result
+    return _dump_result([
+        {"error": str(result)} if isinstance(result, Exception) else result
+        for result in results
+    ])
 
 
 # ---------------------------------------------------------------------------
@@ -5,7 +5,7 @@ Snowflake MCP Server (low-level async, class-based) - With Full execute_query Fe
 This is a pure async MCP server using the low-level `mcp.server` API
 with the same execute_query functionality as the sophisticated server:
 
-- Persistent connection with health checks
+- Pool of persistent connections with health checks
 - Query validation (QueryValidator class)
 - Timeout control (per-query override)
 - Query tagging (auto-generated if not provided)
@@ -19,13 +19,19 @@ Authentication: Password-based (not SSO/externalbrowser)
 import os
 import re
 import json
+import math
 import asyncio
 import logging
+import functools
+import itertools
+import concurrent.futures
+import importlib.util
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 import snowflake.connector
 from snowflake.connector import DictCursor
+from snowflake.connector.errors import InterfaceError, NotSupportedError, OperationalError
 from dotenv import load_dotenv
 
 from mcp.server import Server, NotificationOptions
@@ -33,7 +39,19 @@ from mcp.server import stdio as mcp_stdio
 from mcp.server.models import InitializationOptions
 import mcp.types as types
 
-from config import SnowflakeConfig, ServerConfig
+# Optional: fetch results as Arrow batches when pyarrow is available
+# (pip install "snowflake-connector-python[pandas]"). Checked without
+# importing, since the connector loads pyarrow itself when needed.
+_HAS_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+# Optional: orjson (C extension) for serializing result rows. Falls back
+# to the stdlib json module if missing.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from config import get_snowflake_config, get_server_config
 
 
 # ---------------------------------------------------------------------------
@@ -45,6 +63,17 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger("snowflake-mcp")
 
+# Auto-generated query tags: a process start stamp plus a counter, which is
+# unique per query without formatting a timestamp on every call
+_QUERY_TAG_PREFIX = f"mcp_{datetime.now():%Y%m%d_%H%M%S}_"
+_query_tag_counter = itertools.count(1)
+
+
+# Precompiled patterns used by QueryValidator._normalize_query
+_COMMENT_LINE_RE = re.compile(r'--.*?\n')
+_COMMENT_BLOCK_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+_WHITESPACE_RE = re.compile(r'\s+')
+
 
 # ---------------------------------------------------------------------------
 # QueryValidator Class (from sophisticated server)
@@ -54,25 +83,50 @@ class QueryValidator:
     """Validates SQL queries to ensure they are read-only and safe."""
     
     # Allowed statement types for read-only operations
-    ALLOWED_STATEMENTS = {
+    ALLOWED_STATEMENTS = frozenset({
         'SELECT', 'WITH', 'SHOW', 'DESCRIBE', 'DESC', 'EXPLAIN'
-    }
+    })
     
     # Dangerous keywords that indicate write operations
-    FORBIDDEN_KEYWORDS = {
+    FORBIDDEN_KEYWORDS = frozenset({
         'INSERT', 'UPDATE', 'DELETE', 'DROP', 'CREATE', 'ALTER', 'TRUNCATE',
         'REPLACE', 'MERGE', 'COPY', 'PUT', 'GET', 'REMOVE', 'GRANT', 'REVOKE',
         'USE ROLE', 'USE WAREHOUSE', 'USE DATABASE', 'USE SCHEMA'
-    }
+    })
+    
+    # Error for queries that don't start with an allowed statement (the
+    # keyword sets are fixed, so the message is built once)
+    _NOT_ALLOWED_ERROR = f"Query must start with one of: {', '.join(sorted(ALLOWED_STATEMENTS))}"
+    
+    # All forbidden keywords as one word-bounded alternation, longest first so
+    # multi-word entries win. Spaces in e.g. 'USE ROLE' match any whitespace.
+    _FORBIDDEN_RE = re.compile(
+        r'\b('
+        + '|'.join(
+            re.escape(keyword).replace(r'\ ', r'\s+')
+            for keyword in sorted(FORBIDDEN_KEYWORDS, key=len, reverse=True)
+        )
+        + r')\b'
+    )
     
     @classmethod
     def is_read_only_query(cls, query: str) -> tuple[bool, str]:
         """
         Validate if a query is read-only and safe to execute.
         
+        Results are memoized per process for queries shorter than
+        _VALIDATION_CACHE_MAX_LEN, since clients often re-issue the same SQL.
+        
         Returns:
             tuple: (is_valid, error_message)
         """
+        if query and len(query) < _VALIDATION_CACHE_MAX_LEN:
+            return _validate_query_cached(query)
+        return cls._validate(query)
+    
+    @classmethod
+    def _validate(cls, query: str) -> tuple[bool, str]:
+        """Uncached validation logic behind is_read_only_query."""
         if not query or not query.strip():
             return False, "Query cannot be empty"
         
@@ -81,8 +135,7 @@ class QueryValidator:
         
         # Check if query starts with allowed statement
         if not cls._starts_with_allowed_statement(normalized_query):
-            allowed = ', '.join(sorted(cls.ALLOWED_STATEMENTS))
-            return False, f"Query must start with one of: {allowed}"
+            return False, cls._NOT_ALLOWED_ERROR
         
         # Check for forbidden keywords
         forbidden_found = cls._contains_forbidden_keywords(normalized_query)
@@ -99,32 +152,37 @@ class QueryValidator:
     @classmethod
     def _normalize_query(cls, query: str) -> str:
         """Normalize query for analysis."""
+        # Fast path: no comments and already single-space separated (the
+        # common case for generated SQL). isprintable() is False for any
+        # whitespace other than ' ', so newlines/tabs still take the slow path.
+        if '--' not in query and '/*' not in query and '  ' not in query and query.isprintable():
+            return query.strip().upper()
+        
         # Remove comments
-        query = re.sub(r'--.*?\n', ' ', query)
-        query = re.sub(r'/\*.*?\*/', ' ', query, flags=re.DOTALL)
+        query = _COMMENT_LINE_RE.sub(' ', query)
+        query = _COMMENT_BLOCK_RE.sub(' ', query)
         
         # Normalize whitespace
-        query = re.sub(r'\s+', ' ', query.strip().upper())
+        query = _WHITESPACE_RE.sub(' ', query.strip().upper())
         
         return query
     
     @classmethod
     def _starts_with_allowed_statement(cls, query: str) -> bool:
         """Check if query starts with an allowed statement."""
-        for statement in cls.ALLOWED_STATEMENTS:
-            if query.startswith(statement + ' ') or query == statement:
-                return True
-        return False
+        # Query is already uppercased with single-space separators, so the
+        # first token is everything up to the first space: one set lookup
+        # instead of a startswith() per allowed statement.
+        end = query.find(' ')
+        first_token = query if end < 0 else query[:end]
+        return first_token in cls.ALLOWED_STATEMENTS
     
     @classmethod
     def _contains_forbidden_keywords(cls, query: str) -> Optional[str]:
         """Check for forbidden keywords in the query."""
-        for keyword in cls.FORBIDDEN_KEYWORDS:
-            # Use word boundaries to avoid false positives
-            pattern = r'\b' + re.escape(keyword) + r'\b'
-            if re.search(pattern, query):
-                return keyword
-        return None
+        # Single pass over the query; word boundaries avoid false positives
+        match = cls._FORBIDDEN_RE.search(query)
+        return match.group(1) if match else None
     
     @classmethod
     def _validate_cte_query(cls, query: str) -> bool:
@@ -133,6 +191,149 @@ class QueryValidator:
         return 'SELECT' in query and query.rindex('SELECT') > query.index('WITH')
 
 
+# Queries at or above this length skip the validation cache
+_VALIDATION_CACHE_MAX_LEN = 8192
+
+
+@functools.lru_cache(maxsize=1024)
+def _validate_query_cached(query: str) -> tuple[bool, str]:
+    """Memoized QueryValidator._validate for short, frequently repeated queries."""
+    return QueryValidator._validate(query)
+
+
+# ---------------------------------------------------------------------------
+# Row limit push-down
+# ---------------------------------------------------------------------------
+
+# One SQL token per match: comments, quoted strings/identifiers, words,
+# parentheses and semicolons, then any other single character
+_SQL_TOKEN_RE = re.compile(
+    r"--[^\n]*|//[^\n]*|/\*.*?\*/"
+    r"|'(?:[^'\\]|\\.|'')*'|\"(?:[^\"]|\"\")*\"|\$\$.*?\$\$"
+    r"|[A-Za-z_][A-Za-z0-9_$]*|\S",
+    re.DOTALL,
+)
+
+# Top-level keywords that mean the query already bounds (or offsets) its rows
+_ROW_LIMIT_KEYWORDS = frozenset({'LIMIT', 'FETCH', 'TOP', 'OFFSET'})
+
+
+def _with_row_limit(query: str, limit: int) -> Optional[str]:
+    """Return the query with `LIMIT <limit>` appended, or None to run it as is.
+    
+    Only plain SELECT / WITH queries are rewritten, and only when no LIMIT,
+    FETCH, TOP or OFFSET appears outside parentheses. The LIMIT is appended
+    rather than wrapping the query in a subquery, so its ORDER BY still
+    applies and duplicate column names stay legal. Anything the scan can't
+    place with certainty (unbalanced parentheses, text after a semicolon)
+    is left alone.
+    """
+    depth = 0
+    first_word = None
+    body_end = 0
+    ended = False
+    
+    for match in _SQL_TOKEN_RE.finditer(query):
+        token = match.group()
+        if token[0] in '-/' and token[:2] in ('--', '//', '/*'):
+            continue  # comments don't count as part of the statement
+        if ended:
+            return None  # more SQL after a ';'
+        if token == ';':
+            if depth:
+                return None
+            ended = True
+            continue
+        
+        body_end = match.end()
+        if token == '(':
+            depth += 1
+        elif token == ')':
+            depth -= 1
+            if depth < 0:
+                return None
+        elif depth == 0 and (token[0].isalpha() or token[0] == '_'):
+            word = token.upper()
+            if first_word is None:
+                first_word = word
+            elif word in _ROW_LIMIT_KEYWORDS:
+                return None
+    
+    if depth or first_word not in ('SELECT', 'WITH'):
+        return None
+    # Trailing comments and ';' are dropped; LIMIT goes on its own line
+    return f"{query[:body_end]}\nLIMIT {limit}"
+
+
+# ---------------------------------------------------------------------------
+# Result fetching helpers
+# ---------------------------------------------------------------------------
+
+def _has_non_finite(rows: List[Dict[str, Any]]) -> bool:
+    """Return True if any row holds a NaN or infinite float."""
+    return any(
+        isinstance(value, float) and not math.isfinite(value)
+        for row in rows
+        for value in row.values()
+    )
+
+
+def _dump_rows(rows: List[Dict[str, Any]]) -> str:
+    """Serialize result rows to indented JSON (orjson when available)."""
+    # orjson silently writes NaN/Infinity as null and rejects ints wider
+    # than 64 bits (NUMBER(38,0)); those results go through json instead
+    if orjson is not None and not _has_non_finite(rows):
+        try:
+            # datetimes are native to orjson; str() covers Decimal and friends
+            return orjson.dumps(rows, option=orjson.OPT_INDENT_2, default=str).decode()
+        except orjson.JSONEncodeError:
+            pass
+    # Match orjson's output: ISO 8601 dates/times, str() for everything else
+    return json.dumps(
+        rows,
+        indent=2,
+        ensure_ascii=False,
+        default=lambda value: value.isoformat() if hasattr(value, "isoformat") else str(value),
+    )
+
+
+def _fetch_arrow_rows(cursor, max_rows: int) -> tuple[List[Dict[str, Any]], bool]:
+    """Collect up to max_rows rows from the cursor's Arrow result batches.
+    
+    Batches stay columnar while streaming; only the rows we actually return
+    are converted to Python dicts at the end.
+    
+    Raises:
+        NotSupportedError: If the result set is not in Arrow format
+            (e.g. SHOW commands, which Snowflake returns as JSON).
+    
+    Returns:
+        tuple: (rows, has_more_rows)
+    """
+    tables = []
+    collected = 0
+    has_more = False
+    
+    for table in cursor.fetch_arrow_batches():
+        if collected + table.num_rows > max_rows:
+            tables.append(table.slice(0, max_rows - collected))
+            has_more = True
+            break
+        tables.append(table)
+        collected += table.num_rows
+    
+    rows = [row for table in tables for row in table.to_pylist()]
+    return rows, has_more
+
+
+class _DeadlineExceeded(TimeoutError):
+    """Client-side query deadline hit while a worker is still in execute()."""
+    
+    def __init__(self, pending: asyncio.Future) -> None:
+        super().__init__()
+        self.pending = pending  # the worker's execute() call
+
+
 # ---------------------------------------------------------------------------
 # SnowflakeMCPServer Class (with sophisticated features)
 # ---------------------------------------------------------------------------
@@ -142,7 +343,7 @@ class SnowflakeMCPServer:
     Main MCP server class for Snowflake integration.
     
     Features:
-    - Persistent connection with health checks
+    - Pool of persistent connections with health checks
     - Query validation
     - Timeout control
     - Query tagging
@@ -150,53 +351,144 @@ class SnowflakeMCPServer:
     - Row limiting
     """
     
+    # Extra seconds past a query's Snowflake timeout before the server gives
+    # up waiting on it client-side and cancels it
+    TIMEOUT_GRACE_SECONDS = 5
+    
     def __init__(self) -> None:
-        self.snowflake_config = SnowflakeConfig.from_env()
-        self.server_config = ServerConfig.from_env()
-        self.connection: Optional[snowflake.connector.SnowflakeConnection] = None
+        self.snowflake_config = get_snowflake_config()
+        self.server_config = get_server_config()
+        
+        # Pool of authenticated connections, opened lazily up to pool_size.
+        # Each query borrows one, so concurrent tool calls run side by side
+        # instead of sharing a single connection.
+        self._pool: asyncio.Queue[snowflake.connector.SnowflakeConnection] = asyncio.Queue()
+        self._pool_slots = asyncio.Semaphore(self.server_config.pool_size)
+        
+        # Dedicated thread pool for blocking Snowflake calls, created on first use
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
         
         # Configure logging level
         logger.setLevel(self.server_config.log_level)
     
+    @property
+    def executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """Lazy-create the thread pool that runs blocking Snowflake calls.
+        
+        A dedicated pool keeps queries from competing with other users of
+        asyncio's shared default executor. One worker per pooled connection
+        is enough: a thread is only used while a connection is borrowed.
+        """
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.server_config.pool_size,
+                thread_name_prefix="sf-query",
+            )
+        return self._executor
+    
     # ----- Connection Management -----------------------------------------------
     
-    async def connect(self) -> bool:
-        """Establish connection to Snowflake with health checks."""
+    async def connect(self) -> snowflake.connector.SnowflakeConnection:
+        """Open a new Snowflake connection.
+        
+        The blocking connector call (TCP + TLS + auth) runs in a worker
+        thread so it never stalls the event loop.
+        """
+        logger.info("🔗 Connecting to Snowflake...")
+        loop = asyncio.get_running_loop()
+        connection = await loop.run_in_executor(
+            self.executor,
+            functools.partial(
+                snowflake.connector.connect,
+                **self.snowflake_config.to_connection_params(),
+            ),
+        )
+        logger.info("✅ Successfully connected to Snowflake")
+        return connection
+    
+    async def _acquire(self) -> snowflake.connector.SnowflakeConnection:
+        """Borrow a healthy connection from the pool, waiting if all are in use.
+        
+        Raises:
+            Exception: If a new connection could not be established
+        """
+        await self._pool_slots.acquire()
         try:
-            logger.info(f"🔍 Connection check - self.connection exists: {self.connection is not None}")
-            
-            if self.connection:
-                is_closed = self.connection.is_closed()
-                logger.info(f"🔍 Connection state - is_closed(): {is_closed}")
-                if not is_closed:
-                    logger.info("✅ Reusing existing healthy connection")
-                    return True
-                else:
-                    logger.info("❌ Connection exists but is closed, need to reconnect")
-            else:
-                logger.info("❌ No existing connection, creating new one")
+            if self._pool.empty():
+                logger.info("❌ No idle connection, creating new one")
+                return await self.connect()
             
-            logger.info("🔗 Connecting to Snowflake...")
-            self.connection = snowflake.connector.connect(
-                **self.snowflake_config.to_connection_params()
-            )
-            logger.info("✅ Successfully connected to Snowflake")
-            return True
+            # Health check: replace connections that closed while idle
+            connection = self._pool.get_nowait()
+            if connection.is_closed():
+                logger.info("❌ Connection exists but is closed, need to reconnect")
+                return await self.connect()
+            logger.debug("✅ Reusing existing healthy connection")
+            return connection
             
         except Exception as e:
+            self._pool_slots.release()
             logger.error(f"Failed to connect to Snowflake: {e}")
-            self.connection = None
-            return False
+            raise Exception("Could not establish connection to Snowflake") from e
+        except BaseException:
+            # Cancelled while connecting - give the slot back
+            self._pool_slots.release()
+            raise
+    
+    def _release(
+        self,
+        connection: snowflake.connector.SnowflakeConnection,
+        reusable: bool = True,
+        busy: Optional[asyncio.Future] = None
+    ) -> None:
+        """Return a borrowed connection to the pool, or drop it if it's broken.
+        
+        Dropped connections are closed in the background and their slot is
+        freed, so the next _acquire() opens a replacement. If a worker thread
+        is still blocked on the connection (``busy``), the slot is only freed
+        once that call returns, so slots never outnumber free workers.
+        """
+        if reusable and busy is None and not connection.is_closed():
+            self._pool.put_nowait(connection)
+        else:
+            logger.info("❌ Dropping broken connection from the pool")
+            asyncio.get_running_loop().run_in_executor(None, self._close_quietly, connection)
+        
+        if busy is not None and not busy.done():
+            busy.add_done_callback(self._release_slot_when_done)
+        else:
+            self._pool_slots.release()
+    
+    def _release_slot_when_done(self, future: asyncio.Future) -> None:
+        """Free the pool slot held by an abandoned worker call once it finishes."""
+        if not future.cancelled() and future.exception() is None:
+            # Its late result is an open cursor nobody will read
+            future.result().close()
+        self._pool_slots.release()
+    
+    @staticmethod
+    def _close_quietly(connection: snowflake.connector.SnowflakeConnection) -> None:
+        """Close a connection that is being discarded, logging any error."""
+        try:
+            connection.close()
+        except Exception as e:
+            logger.error(f"Error closing connection: {e}")
     
     async def disconnect(self):
-        """Close Snowflake connection."""
-        if self.connection and not self.connection.is_closed():
+        """Close all pooled Snowflake connections."""
+        while not self._pool.empty():
+            connection = self._pool.get_nowait()
+            if connection.is_closed():
+                continue
             try:
-                self.connection.close()
+                connection.close()
                 logger.info("Disconnected from Snowflake")
             except Exception as e:
                 logger.error(f"Error closing connection: {e}")
-        self.connection = None
+        
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
     
     # ----- Query Execution -----------------------------------------------------
     
@@ -217,36 +509,46 @@ class SnowflakeMCPServer:
             disable_cache: Whether to disable Snowflake result caching (default: True)
         
         Returns:
-            Dict with columns, rows, row_count, query_id, has_more_rows, max_rows_returned
+            Dict with columns, rows, row_count, query_id, has_more_rows, max_rows_returned,
+            row_limit_pushed_down (LIMIT appended to the SQL, or None)
         """
-        if not await self.connect():
-            raise Exception("Could not establish connection to Snowflake")
-        
         # Use provided timeout or fall back to default
         query_timeout = timeout_seconds if timeout_seconds is not None else self.snowflake_config.timeout
         
         # Auto-generate query tag if not provided
         if not query_tag:
-            query_tag = f"mcp_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')[:-3]}"
+            query_tag = _QUERY_TAG_PREFIX + str(next(_query_tag_counter))
         
+        connection = await self._acquire()
+        reusable = False
+        busy = None
         try:
             result = await self._execute_query_with_options(
-                query, query_timeout, query_tag, disable_cache
+                connection, query, query_timeout, query_tag, disable_cache
             )
+            reusable = True
             return result
             
         except Exception as e:
-            # Check for Snowflake timeout error (error code 604)
-            if hasattr(e, 'errno') and e.errno == 604:
+            # SQL errors leave the session usable; network/session failures
+            # and client-side deadlines (worker may still be using it) don't
+            reusable = not isinstance(e, (OperationalError, InterfaceError, TimeoutError))
+            busy = e.pending if isinstance(e, _DeadlineExceeded) else None
+            
+            # Check for our client-side deadline or Snowflake timeout error (error code 604)
+            if isinstance(e, TimeoutError) or (hasattr(e, 'errno') and e.errno == 604):
                 error_msg = f"Query timed out after {query_timeout} seconds"
                 logger.error(error_msg)
                 raise Exception(error_msg)
             else:
                 logger.error(f"Query execution failed: {e}")
                 raise Exception(f"Query failed: {str(e)}")
+        finally:
+            self._release(connection, reusable, busy)
     
     async def _execute_query_with_options(
         self,
+        connection: snowflake.connector.SnowflakeConnection,
         query: str,
         timeout_seconds: int,
         query_tag: str,
@@ -254,52 +556,121 @@ class SnowflakeMCPServer:
     ) -> Dict[str, Any]:
         """Execute query with session options (tag, cache control, timeout)."""
         
-        def _run_query():
-            cursor = self.connection.cursor(DictCursor)
+        # Query tag and cache control are sent as statement-level parameters
+        # with the query itself, so no ALTER SESSION round-trips are needed
+        # before or after it (and the pooled session is left untouched).
+        statement_params = {"QUERY_TAG": query_tag}
+        if disable_cache:
+            statement_params["USE_CACHED_RESULT"] = "FALSE"
+        
+        max_rows = self.server_config.max_query_rows
+        
+        # Let Snowflake stop after the rows we can return (plus one to detect
+        # truncation) instead of materializing the full result set
+        limited_query = _with_row_limit(query, max_rows + 1)
+        row_limit = max_rows + 1 if limited_query is not None else None
+        if limited_query is None:
+            limited_query = query
+        
+        def _execute():
+            cursor = connection.cursor(DictCursor)
+            try:
+                # Execute main query with timeout (enforced by Snowflake)
+                cursor.execute(
+                    limited_query,
+                    timeout=timeout_seconds,
+                    _statement_params=statement_params,
+                )
+            except BaseException:
+                cursor.close()
+                raise
+            return cursor
+        
+        def _fetch(cursor):
             try:
-                # Set cache control if disabled
-                if disable_cache:
-                    cursor.execute("ALTER SESSION SET USE_CACHED_RESULT = FALSE")
-                
-                # Set query tag
-                escaped_tag = query_tag.replace("'", "''")
-                cursor.execute(f"ALTER SESSION SET QUERY_TAG = '{escaped_tag}'")
-                
-                # Execute main query with timeout
-                cursor.execute(query, timeout=timeout_seconds)
-                
                 # Capture query ID immediately after execution
                 query_id = getattr(cursor, 'sfqid', None)
                 
                 # Get column information
                 columns = [desc[0] for desc in cursor.description] if cursor.description else []
                 
-                # Fetch results with row limit
-                rows = cursor.fetchmany(self.server_config.max_query_rows)
-                
-                # Check if there are more rows
-                has_more = len(cursor.fetchmany(1)) > 0
+                # Fetch results with row limit - Arrow batches when possible
+                rows = None
+                if _HAS_PYARROW and cursor.description:
+                    try:
+                        rows, has_more = _fetch_arrow_rows(cursor, max_rows)
+                    except NotSupportedError:
+                        # JSON result format - use the row-based path below
+                        rows = None
                 
-                # Reset session settings
-                cursor.execute("ALTER SESSION SET QUERY_TAG = NULL")
-                if disable_cache:
-                    cursor.execute("ALTER SESSION SET USE_CACHED_RESULT = TRUE")
+                if rows is None:
+                    # Fetch one extra row in the same call to detect overflow
+                    # (a separate fetchmany(1) probe can cost another
+                    # result-chunk download)
+                    rows = cursor.fetchmany(max_rows + 1)
+                    has_more = len(rows) > max_rows
+                    del rows[max_rows:]
                 
                 return {
                     "columns": columns,
                     "rows": rows,
                     "row_count": len(rows),
                     "has_more_rows": has_more,
-                    "max_rows_returned": self.server_config.max_query_rows,
+                    "max_rows_returned": max_rows,
+                    # LIMIT appended to the SQL Snowflake ran, or None if unchanged
+                    "row_limit_pushed_down": row_limit,
                     "query_id": query_id,
                     "query_tag": query_tag
                 }
             finally:
                 cursor.close()
         
-        # Run the synchronous query in a thread pool to avoid blocking the event loop
+        # Run the synchronous calls in our thread pool to avoid blocking the
+        # event loop. Callers hold a pool slot, which bounds queued work.
+        #
+        # Snowflake enforces timeout_seconds on execution itself; the
+        # client-side deadline only fires if no answer comes back at all
+        # (e.g. a stalled network call). It covers the execute phase only -
+        # fetching a large result may legitimately take longer.
         loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, _run_query)
+        execute = loop.run_in_executor(self.executor, _execute)
+        try:
+            async with asyncio.timeout(timeout_seconds + self.TIMEOUT_GRACE_SECONDS):
+                cursor = await asyncio.shield(execute)
+        except TimeoutError:
+            await self._cancel_running_queries(connection)
+            raise _DeadlineExceeded(execute) from None
+        
+        return await loop.run_in_executor(self.executor, _fetch, cursor)
+    
+    async def _cancel_running_queries(
+        self,
+        connection: snowflake.connector.SnowflakeConnection
+    ) -> None:
+        """Ask Snowflake to stop whatever is still running in the connection's session.
+        
+        A blocking execute() only learns its query ID once it returns, so the
+        query is cancelled by session instead. Pooled connections run one
+        query at a time, so that is exactly the query that timed out. The
+        connection is then discarded rather than pooled again.
+        """
+        def _cancel():
+            cursor = connection.cursor()
+            try:
+                cursor.execute(
+                    "SELECT SYSTEM$CANCEL_ALL_QUERIES(%s)", (connection.session_id,)
+                )
+            finally:
+                cursor.close()
+        
+        # Default executor: every query worker may be stuck on a timed-out call
+        loop = asyncio.get_running_loop()
+        try:
+            async with asyncio.timeout(self.TIMEOUT_GRACE_SECONDS):
+                await loop.run_in_executor(None, _cancel)
+            logger.info("Cancelled timed-out query")
+        except Exception as e:
+            logger.error(f"Failed to cancel timed-out query: {e!r}")
 
 
 # ---------------------------------------------------------------------------
@@ -310,6 +681,23 @@ snowflake_server = SnowflakeMCPServer()
 server = Server("SnowflakeMCP")
 
 
+# Layout of a successful execute_query response, filled in with one format()
+# call. The *_line fields are either a whole line or empty.
+_QUERY_RESPONSE_TEMPLATE = (
+    "Query executed successfully!\n\n"
+    "{query_id_line}"
+    "Query tag: {query_tag}\n"
+    "Result cache: {cache_status}\n"
+    "Timeout: {timeout} seconds ({timeout_minutes:.1f} minutes)\n"
+    "{row_limit_line}"
+    "Columns: {columns}\n"
+    "Rows returned: {row_count}\n"
+    "{truncated_line}"
+    "\nResults:\n"
+    "{rows}"
+)
+
+
 @server.list_tools()
 async def handle_list_tools() -> list[types.Tool]:
     """
@@ -372,8 +760,17 @@ async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent
                 if not isinstance(timeout_seconds, int) or timeout_seconds < 1 or timeout_seconds > 3600:
                     raise ValueError("Timeout must be an integer between 1 and 3600 seconds")
             
-            # Validate query is read-only
-            is_valid, error_message = QueryValidator.is_read_only_query(query)
+            # Validate query is read-only. Short queries are answered from the
+            # validation cache; longer ones bypass it and run several regex
+            # passes, so they go to a worker thread instead of holding up
+            # other tool calls on the event loop.
+            if len(query) < _VALIDATION_CACHE_MAX_LEN:
+                is_valid, error_message = QueryValidator.is_read_only_query(query)
+            else:
+                loop = asyncio.get_running_loop()
+                is_valid, error_message = await loop.run_in_executor(
+                    None, QueryValidator.is_read_only_query, query
+                )
             if not is_valid:
                 raise ValueError(f"Query validation failed: {error_message}")
             
@@ -386,30 +783,29 @@ async def handle_call_tool(name: str, arguments: dict) -> list[types.TextContent
             )
             
             # Format results for display (matching sophisticated server format)
-            output = f"Query executed successfully!\n\n"
-            
-            # Show query ID (most important for performance analysis)
-            if result.get('query_id'):
-                output += f"Query ID: {result['query_id']}\n"
-            
-            # Show query tag
-            output += f"Query tag: {result['query_tag']}\n"
-            
-            # Show cache status
-            cache_status = "DISABLED" if disable_cache else "ENABLED"
-            output += f"Result cache: {cache_status}\n"
-            
-            # Show timeout information
             actual_timeout = timeout_seconds if timeout_seconds is not None else snowflake_server.snowflake_config.timeout
-            output += f"Timeout: {actual_timeout} seconds ({actual_timeout/60:.1f} minutes)\n"
-            output += f"Columns: {', '.join(result['columns'])}\n"
-            output += f"Rows returned: {result['row_count']}\n"
-            
-            if result['has_more_rows']:
-                output += f"⚠️  Results limited to {result['max_rows_returned']} rows. Query returned more data.\n"
-            
-            output += "\nResults:\n"
-            output += json.dumps(result['rows'], indent=2, default=str)
+            output = _QUERY_RESPONSE_TEMPLATE.format(
+                # Query ID first (most important for performance analysis)
+                query_id_line=f"Query ID: {result['query_id']}\n" if result.get('query_id') else "",
+                query_tag=result['query_tag'],
+                cache_status="DISABLED" if disable_cache else "ENABLED",
+                timeout=actual_timeout,
+                timeout_minutes=actual_timeout / 60,
+                # The SQL that ran differs from the caller's; say so, since
+                # a LIMIT can change the plan (e.g. ORDER BY becomes top-k)
+                row_limit_line=(
+                    f"Row limit pushed down: LIMIT {result['row_limit_pushed_down']} "
+                    "appended to the query sent to Snowflake\n"
+                    if result['row_limit_pushed_down'] is not None else ""
+                ),
+                columns=', '.join(result['columns']),
+                row_count=result['row_count'],
+                truncated_line=(
+                    f"⚠️  Results limited to {result['max_rows_returned']} rows. Query returned more data.\n"
+                    if result['has_more_rows'] else ""
+                ),
+                rows=_dump_rows(result['rows']),
+            )
             
             return [types.TextContent(type="text", text=output)]
         
@@ -441,7 +837,7 @@ async def main() -> None:
         async with mcp_stdio.stdio_server() as (read, write):
             await server.run(read, write, options)
     finally:
-        # Clean up connection on exit
+        # Clean up pooled connections on exit
         await snowflake_server.disconnect()
 
 
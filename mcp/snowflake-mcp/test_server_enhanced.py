@@ -0,0 +1,165 @@
+"""
+Tests for server_enhanced.py's query paths, run against a fake connector.
+
+    python -m unittest test_server_enhanced
+
+The fake cursor mimics the snowflake-connector-python behaviors these
+paths depend on: execute_async() leaves description unset, and
+get_results_from_sfqid() only installs a prefetch hook that runs on the
+next fetch* call, so description stays None until then.
+"""
+
+import asyncio
+import os
+import unittest
+
+from snowflake.connector.errors import NotSupportedError
+
+import server_enhanced
+
+
+# SQL -> (column names, row tuples)
+TABLES = {
+    "SELECT ID, NAME FROM USERS": (["ID", "NAME"], [(1, "Alice"), (2, "Bob")]),
+    "SELECT SKU FROM ITEMS": (["SKU"], [("A-1",)]),
+}
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.sfqid = None
+        self._description = None
+        self._rows = []
+        self._prefetch_hook = None
+        self._closed = False
+
+    @property
+    def description(self):
+        # Like the connector, this does not run the prefetch hook
+        return self._description
+
+    def _load(self, sql):
+        columns, rows = TABLES[sql]
+        self._description = [(name,) for name in columns]
+        self._rows = list(rows)
+
+    def execute(self, sql, *args, **kwargs):
+        self._prefetch_hook = None
+        self._load(sql)
+        return self
+
+    def execute_async(self, sql, *args, **kwargs):
+        # Submits only: no result or metadata yet (previous description stays)
+        self._prefetch_hook = None
+        self.sfqid = f"qid-{len(self.conn.queries)}"
+        self.conn.queries[self.sfqid] = sql
+        return self
+
+    def get_results_from_sfqid(self, sfqid):
+        self._prefetch_hook = lambda: self._load(self.conn.queries[sfqid])
+
+    def query_result(self, sfqid):
+        self._prefetch_hook = None
+        self._load(self.conn.queries[sfqid])
+        return self
+
+    def _run_hook(self):
+        if self._prefetch_hook is not None:
+            self._prefetch_hook()
+            self._prefetch_hook = None
+
+    def fetch_arrow_batches(self):
+        self._run_hook()
+        raise NotSupportedError("JSON result format")
+
+    def fetchmany(self, size):
+        self._run_hook()
+        rows, self._rows = self._rows[:size], self._rows[size:]
+        return rows
+
+    def close(self):
+        self._closed = True
+
+    def is_closed(self):
+        return self._closed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class FakeConnection:
+    def __init__(self):
+        self.queries = {}
+        self._closed = False
+
+    def cursor(self, *args):
+        return FakeCursor(self)
+
+    def get_query_status_throw_if_error(self, sfqid):
+        return "SUCCESS"
+
+    def is_still_running(self, status):
+        return False
+
+    def is_closed(self):
+        return self._closed
+
+    def close(self):
+        self._closed = True
+
+
+class ExecuteQueryAsyncTest(unittest.TestCase):
+    def setUp(self):
+        # No result cache, one pooled connection shared by every query
+        os.environ["MCP_QUERY_TTL"] = "0"
+        os.environ["SNOWFLAKE_POOL_SIZE"] = "1"
+        self.addCleanup(os.environ.pop, "MCP_QUERY_TTL", None)
+        self.addCleanup(os.environ.pop, "SNOWFLAKE_POOL_SIZE", None)
+
+        self.server = server_enhanced.SnowflakeMCPServer()
+        self.server.get_snowflake_connection = FakeConnection
+
+    def test_returns_columns_and_rows(self):
+        result = asyncio.run(self.server.execute_query_async("SELECT ID, NAME FROM USERS"))
+        self.assertEqual(result["columns"], ["ID", "NAME"])
+        self.assertEqual(result["row_count"], 2)
+        self.assertEqual(result["rows"], [{"ID": 1, "NAME": "Alice"}, {"ID": 2, "NAME": "Bob"}])
+
+    def test_after_sync_query_on_same_connection(self):
+        async def run():
+            # Sync query first, so the pooled connection's cursor has metadata
+            await asyncio.to_thread(self.server.execute_query, "SELECT ID, NAME FROM USERS")
+            return await self.server.execute_query_async("SELECT SKU FROM ITEMS")
+
+        result = asyncio.run(run())
+        self.assertEqual(result["columns"], ["SKU"])
+        self.assertEqual(result["rows"], [{"SKU": "A-1"}])
+
+    def test_cache_hit_is_marked_copy(self):
+        os.environ["MCP_QUERY_TTL"] = "30"
+        server = server_enhanced.SnowflakeMCPServer()
+        server.get_snowflake_connection = FakeConnection
+
+        async def run():
+            first = await server.execute_query_async("SELECT ID, NAME FROM USERS")
+            first["rows"][0]["NAME"] = "changed"
+            return first, await server.execute_query_async("SELECT ID, NAME FROM USERS")
+
+        first, second = asyncio.run(run())
+        self.assertNotIn("cached", first)
+        self.assertTrue(second["cached"])
+        self.assertEqual(second["rows"][0], {"ID": 1, "NAME": "Alice"})
+
+    def test_columnar(self):
+        result = asyncio.run(
+            self.server.execute_query_async("SELECT ID, NAME FROM USERS", columnar=True)
+        )
+        self.assertEqual(result["data"], [[1, 2], ["Alice", "Bob"]])
+
+
+if __name__ == "__main__":
+    unittest.main()